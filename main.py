@@ -0,0 +1,85 @@
+"""
+Runs and times the solvers for each day.
+
+    python main.py                  # every day
+    python main.py 5 7              # just day 5 and day 7
+    python main.py --repeat 20 --json
+    python main.py --workers 4      # spread the days over 4 processes
+    python main.py --no-cache       # don't record the answers in the cache
+    python main.py --phases         # split the time into read, parse and solve
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent
+
+# The solvers find their input relative to the root of the repo
+os.chdir(ROOT)
+sys.path.insert(0, str(ROOT / "src"))
+
+import runner  # noqa: E402
+from answer_cache import AnswerCache  # noqa: E402
+from common import import_times_by_day  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("days", nargs="*", help="days to run - defaults to all")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="output json")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="run the solvers in a pool of this many processes (0 for one per core)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="don't record the answers in the on disk answer cache",
+    )
+    parser.add_argument("--cache-size", type=int, default=256)
+    parser.add_argument(
+        "--phases",
+        action="store_true",
+        help="break each solver's time down into read, parse and solve",
+    )
+    parser.add_argument(
+        "--import-times",
+        action="store_true",
+        help="report how long each day's modules took to import",
+    )
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else AnswerCache(max_entries=args.cache_size)
+    solvers = runner.select_solvers(runner.discover_solvers(), args.days)
+    start = time.perf_counter()
+    timings = runner.time_solvers(
+        solvers,
+        warmup=args.warmup,
+        repeat=args.repeat,
+        workers=args.workers,
+        cache=cache,
+        phases=args.phases,
+    )
+    elapsed = time.perf_counter() - start
+    if args.json:
+        print(runner.format_json(timings))
+    else:
+        print(runner.format_table(timings))
+        if args.phases:
+            print()
+            print(runner.format_phases(timings))
+        print(f"\n{len(timings)} solvers in {elapsed:.2f}s", file=sys.stderr)
+    if args.import_times:
+        for day, taken in import_times_by_day().items():
+            print(f"{day} imported in {taken / 1_000_000:.2f}ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from common import Solver
+
+DEFAULT_CACHE_PATH = "./.answer_cache.json"
+DEFAULT_MAX_ENTRIES = 256
+
+Digest = str
+
+
+class AnswerCache:
+    """
+    Remembers solver answers on disk. Entries are keyed on the content of the
+    solver's module and its input file so editing either one misses the cache.
+    Once more than max_entries answers are held the least recently used ones go.
+    """
+
+    path: Path
+    max_entries: int
+    _entries: OrderedDict[Digest, object]
+    _file_digests: dict[tuple[Path, int, int], Digest]
+
+    def __init__(
+        self, path: str = DEFAULT_CACHE_PATH, *, max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        if max_entries < 1:
+            raise ValueError("The cache needs room for at least one answer")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._entries = OrderedDict(_load(self.path))
+        self._file_digests = {}
+        self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, solver: Solver) -> bool:
+        return self.key_for(solver) in self._entries
+
+    def get_or_solve(self, solver: Solver) -> object:
+        key = self.key_for(solver)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        answer = solver()
+        self._store(key, answer)
+        self.save()
+        return answer
+
+    def record(self, solver: Solver, answer: object):
+        self._store(self.key_for(solver), answer)
+
+    def key_for(self, solver: Solver) -> Digest:
+        parts = [
+            solver.function,
+            self._digest_of(solver.source_path),
+            self._digest_of(solver.input_path),
+        ]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def save(self):
+        temporary_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(temporary_path, "w") as file:
+            json.dump(list(self._entries.items()), file)
+        os.replace(temporary_path, self.path)
+
+    def clear(self):
+        self._entries.clear()
+        self.save()
+
+    def _store(self, key: Digest, answer: object):
+        self._entries[key] = answer
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _digest_of(self, path: Path) -> Digest:
+        # Rehashing a file on every lookup would make a hit as slow as reading
+        # the input so the digest is only redone when the file looks different.
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return "missing"
+        stat_key = (path, stat.st_mtime_ns, stat.st_size)
+        if stat_key not in self._file_digests:
+            self._file_digests[stat_key] = _hash_file(path)
+        return self._file_digests[stat_key]
+
+
+def _hash_file(path: Path) -> Digest:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def _load(path: Path) -> list[tuple[Digest, object]]:
+    try:
+        with open(path, "r") as file:
+            return [(key, answer) for key, answer in json.load(file)]
+    except (FileNotFoundError, json.JSONDecodeError, ValueError):
+        return []
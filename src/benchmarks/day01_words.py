@@ -0,0 +1,74 @@
+"""
+Finding the first and last number in long lines, the original rescanning
+approach against the Aho-Corasick matcher day01 uses now.
+
+    PYTHONPATH=./src python -m benchmarks.day01_words [--length N]
+"""
+import argparse
+import random
+import time
+from typing import Callable, Iterable
+
+from day01.part_two import (
+    find_first_number,
+    find_last_number,
+    number_words,
+    reversed_number_words,
+)
+
+
+def rescanning_find_first_number(input_chars: Iterable[str], word_lookup) -> str:
+    # How day01 part two originally did it
+    working_string = ""
+    for char in input_chars:
+        if char.isdigit():
+            return char
+        working_string += char
+        for number_word, value in word_lookup:
+            if number_word in working_string:
+                return value
+    raise RuntimeError("No number found")
+
+
+def rescanning_number_for_input(input_chars: str) -> int:
+    first = rescanning_find_first_number(input_chars, number_words)
+    last = rescanning_find_first_number(reversed(input_chars), reversed_number_words)
+    return int(f"{first}{last}")
+
+
+def matcher_number_for_input(input_chars: str) -> int:
+    return int(f"{find_first_number(input_chars)}{find_last_number(input_chars)}")
+
+
+_near_misses = ("on", "tw", "thre", "fou", "fiv", "si", "seve", "eigh", "nin")
+
+
+def long_line(length: int) -> str:
+    # Nothing but near misses with the only real number right in the middle
+    filler = ""
+    while len(filler) < length // 2:
+        filler += random.choice(_near_misses) + "z"
+    return f"{filler}seven{filler}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--length", type=int, default=20_000)
+    parser.add_argument("--lines", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(1)
+    lines = [long_line(args.length) for _ in range(args.lines)]
+    implementations: dict[str, Callable[[str], int]] = {
+        "rescanning": rescanning_number_for_input,
+        "aho-corasick": matcher_number_for_input,
+    }
+    for name, number_for_input in implementations.items():
+        start = time.perf_counter()
+        total = sum(number_for_input(line) for line in lines)
+        taken = time.perf_counter() - start
+        print(f"{name:>14}: {taken:8.3f}s (total {total})")
+
+
+if __name__ == "__main__":
+    main()
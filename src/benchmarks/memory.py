@@ -0,0 +1,196 @@
+"""
+Peak memory used by each solver, measured with tracemalloc.
+
+    PYTHONPATH=./src python -m benchmarks.memory [days...]
+    PYTHONPATH=./src python -m benchmarks.memory --update-baselines
+
+The baselines are checked by benchmarks/test_memory.py so a solver that
+starts using a lot more memory fails the tests.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from common import clear_file_caches, DayRegistry, Solver
+
+R = TypeVar("R")
+
+BASELINES_PATH = Path(__file__).parent / "memory_baselines.json"
+
+# A peak this much over the baseline counts as a regression. The slack
+# absorbs garbage collection timing and differences between python versions.
+ALLOWED_GROWTH = 1.25
+ALLOWED_SLACK_BYTES = 64 * 1024
+
+
+@dataclasses.dataclass
+class MemoryProfile:
+    solver: Solver
+    answer: object
+    peak_bytes: int
+    # Number of live allocations and the biggest allocation sites around the peak
+    peak_blocks: int
+    top_sites: list[tuple[str, int]]
+
+
+class _PeakSnapshotter(threading.Thread):
+    # tracemalloc knows the peak size but not what made it up so a snapshot
+    # is retaken every time traced memory grows by another 10%
+    def __init__(self, interval: float):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self._snapshot_size = 0
+        self._finished = threading.Event()
+
+    def run(self):
+        while not self._finished.wait(self.interval):
+            self.check()
+
+    def check(self):
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self._snapshot_size * 1.1:
+            self.snapshot = tracemalloc.take_snapshot()
+            self._snapshot_size = current
+
+    def finish(self):
+        self._finished.set()
+        self.join()
+
+
+def profile_memory(
+    solver: Solver, *, top: int = 5, interval: float = 0.001
+) -> MemoryProfile:
+    # Load outside of the trace so importing the day isn't counted
+    function = solver.load()
+    # The peak comes from a run of its own as the snapshots taken to find
+    # the allocation sites are traced too and would inflate it
+    clear_file_caches()
+    answer, peak_bytes = peak_memory(function)
+    clear_file_caches()
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(interval / 2)
+    snapshotter = _PeakSnapshotter(interval)
+    tracemalloc.start()
+    try:
+        snapshotter.start()
+        function()
+        snapshotter.finish()
+        if snapshotter.snapshot is None:
+            # Too quick for the snapshotter to ever wake up
+            snapshotter.snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        sys.setswitchinterval(switch_interval)
+    peak_blocks, top_sites = _summarise(snapshotter.snapshot, top)
+    return MemoryProfile(
+        solver=solver,
+        answer=answer,
+        peak_bytes=peak_bytes,
+        peak_blocks=peak_blocks,
+        top_sites=top_sites,
+    )
+
+
+def peak_memory(function: Callable[[], R]) -> tuple[R, int]:
+    tracemalloc.start()
+    try:
+        answer = function()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return answer, peak_bytes
+
+
+def regression(profile: MemoryProfile, baseline_bytes: int) -> bool:
+    return profile.peak_bytes > baseline_bytes * ALLOWED_GROWTH + ALLOWED_SLACK_BYTES
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> dict[str, int]:
+    if not path.exists():
+        return {}
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def save_baselines(baselines: dict[str, int], path: Path = BASELINES_PATH):
+    with open(path, "w") as file:
+        json.dump(dict(sorted(baselines.items())), file, indent=2)
+        file.write("\n")
+
+
+def _summarise(
+    snapshot: tracemalloc.Snapshot | None, top: int
+) -> tuple[int, list[tuple[str, int]]]:
+    if snapshot is None:
+        return 0, []
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+    statistics = snapshot.statistics("lineno")
+    sites = [
+        (f"{os.path.relpath(frame.filename)}:{frame.lineno}", stat.size)
+        for stat in statistics[:top]
+        for frame in [stat.traceback[0]]
+    ]
+    return sum(stat.count for stat in statistics), sites
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("days", nargs="*", help="days to profile - defaults to all")
+    parser.add_argument("--top", type=int, default=3)
+    parser.add_argument("--update-baselines", action="store_true")
+    args = parser.parse_args()
+
+    registry = DayRegistry()
+    days = {f"day{int(day.removeprefix('day')):02d}" for day in args.days}
+    solvers = [s for s in registry.solvers if not days or s.day in days]
+    baselines = load_baselines()
+    for solver in solvers:
+        try:
+            profile = profile_memory(solver, top=args.top)
+        except Exception as e:
+            print(f"{solver.name}: failed - {e!r}", file=sys.stderr)
+            continue
+        baseline = baselines.get(solver.name)
+        status = ""
+        if baseline is not None:
+            status = "REGRESSED" if regression(profile, baseline) else "ok"
+            status = f"(baseline {format_bytes(baseline)} {status})"
+        print(
+            f"{solver.name:<14} peak {format_bytes(profile.peak_bytes):>10} "
+            f"in {profile.peak_blocks:>8} blocks {status}"
+        )
+        for site, size in profile.top_sites:
+            print(f"    {format_bytes(size):>10}  {site}")
+        if args.update_baselines:
+            baselines[solver.name] = profile.peak_bytes
+    if args.update_baselines:
+        save_baselines(baselines)
+
+
+if __name__ == "__main__":
+    main()
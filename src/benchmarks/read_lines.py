@@ -0,0 +1,62 @@
+"""
+Throughput of the line readers in common against the original
+readline based implementation.
+
+    PYTHONPATH=./src python -m benchmarks.read_lines [--copies N]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Iterable
+
+from common import read_lines, read_byte_lines, read_line_batches
+
+
+def readline_and_strip(path: str) -> Iterable[str]:
+    # The implementation read_lines started out with
+    with open(path, "r") as file:
+        while line := file.readline():
+            yield line.strip()
+
+
+READERS: dict[str, Callable[[str], Iterable]] = {
+    "readline (original)": readline_and_strip,
+    "read_lines": read_lines,
+    "read_byte_lines": read_byte_lines,
+    "read_line_batches(4096)": lambda path: read_line_batches(path, 4096),
+}
+
+
+def build_input(source: str, copies: int) -> str:
+    with open(source, "rb") as file:
+        content = file.read()
+    handle, path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(handle, "wb") as file:
+        for _ in range(copies):
+            file.write(content)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source", default="./src/day01/input.txt")
+    parser.add_argument("--copies", type=int, default=2_000)
+    args = parser.parse_args()
+
+    path = build_input(args.source, args.copies)
+    try:
+        size_mb = os.path.getsize(path) / 1_000_000
+        print(f"{size_mb:.1f} MB of input")
+        for name, reader in READERS.items():
+            start = time.perf_counter()
+            for _ in reader(path):
+                pass
+            taken = time.perf_counter() - start
+            print(f"{name:>25}: {taken:7.3f}s {size_mb / taken:8.1f} MB/s")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
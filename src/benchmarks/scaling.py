@@ -0,0 +1,118 @@
+"""
+Runs every solver against generated inputs 1x, 10x, 100x... the size of the
+real input and tabulates how the runtime and peak memory grow.
+
+    PYTHONPATH=./src python -m benchmarks.scaling [days...] [--scales 1 10 100 1000]
+
+The growth column is the exponent k in time ~ size^k between one scale and
+the last one, so 1.0 is linear and 2.0 quadratic.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import importlib
+import math
+import os
+import tempfile
+import time
+from typing import Callable, Iterable
+
+from benchmarks.memory import format_bytes, peak_memory
+from common import clear_file_caches, DayRegistry, Solver, import_solver_module
+
+DEFAULT_SCALES = (1, 10, 100)
+
+# Kerning the races together makes part two one race whatever the scale,
+# and at any real scale that race is too big to solve with floats
+NOT_SCALABLE = {"day06 part two"}
+
+
+@dataclasses.dataclass
+class Measurement:
+    solver: Solver
+    scale: int
+    input_bytes: int
+    seconds: float
+    peak_bytes: int
+
+
+def write_input(day: str, scale: int, seed: int, path: str):
+    generator = importlib.import_module(f"{day}.generator")
+    with open(path, "w") as file:
+        for line in generator.generate(scale, seed):
+            file.write(line)
+            file.write("\n")
+
+
+def solver_for_file(solver: Solver) -> Callable[[str], object]:
+    module = import_solver_module(solver.module)
+    return getattr(module, f"{solver.function}_for_file")
+
+
+def measure(
+    solvers: Iterable[Solver], scales: Iterable[int], *, seed: int = 0
+) -> Iterable[Measurement]:
+    with tempfile.TemporaryDirectory() as directory:
+        for solver in solvers:
+            for scale in scales:
+                path = os.path.join(directory, f"{solver.day}-{scale}.txt")
+                if not os.path.exists(path):
+                    write_input(solver.day, scale, seed, path)
+                function = solver_for_file(solver)
+                clear_file_caches()
+                start = time.perf_counter()
+                function(path)
+                seconds = time.perf_counter() - start
+                clear_file_caches()
+                _, peak_bytes = peak_memory(lambda: function(path))
+                yield Measurement(
+                    solver=solver,
+                    scale=scale,
+                    input_bytes=os.path.getsize(path),
+                    seconds=seconds,
+                    peak_bytes=peak_bytes,
+                )
+
+
+def growth(first: Measurement, last: Measurement) -> str:
+    if first is last or first.seconds == 0:
+        return ""
+    size_ratio = last.input_bytes / first.input_bytes
+    return f"{math.log(last.seconds / first.seconds) / math.log(size_ratio):.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("days", nargs="*", help="days to run - defaults to all")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    days = {f"day{int(day.removeprefix('day')):02d}" for day in args.days}
+    solvers = [
+        solver
+        for solver in DayRegistry().solvers
+        if (not days or solver.day in days) and solver.name not in NOT_SCALABLE
+    ]
+    print(
+        f"{'solver':<14} {'scale':>6} {'input':>10} {'time':>10} "
+        f"{'peak memory':>12} {'growth':>7}"
+    )
+    first: Measurement | None = None
+    for measurement in measure(solvers, args.scales, seed=args.seed):
+        if first is None or first.solver != measurement.solver:
+            first = measurement
+        print(
+            f"{measurement.solver.name:<14} {measurement.scale:>5}x "
+            f"{format_bytes(measurement.input_bytes):>10} "
+            f"{measurement.seconds:>9.3f}s "
+            f"{format_bytes(measurement.peak_bytes):>12} "
+            f"{growth(first, measurement):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from benchmarks.scaling import NOT_SCALABLE, solver_for_file, write_input
+from common import DayRegistry
+from day08.generator import GHOSTS, NODES, _distinct_primes_near
+from day08.part_one_and_two import solve_part_one_for_file, solve_part_two_for_file
+
+solvers = [s for s in DayRegistry().solvers if s.name not in NOT_SCALABLE]
+
+
+@pytest.mark.parametrize("solver", solvers, ids=lambda s: s.name)
+def test_generated_inputs_can_be_solved(solver, tmp_path):
+    path = str(tmp_path / "input.txt")
+    write_input(solver.day, 1, 0, path)
+
+    assert isinstance(solver_for_file(solver)(path), int)
+
+
+@pytest.mark.parametrize("day", DayRegistry().days)
+def test_generators_are_repeatable_for_a_seed(day, tmp_path):
+    write_input(day, 1, 7, str(tmp_path / "a.txt"))
+    write_input(day, 1, 7, str(tmp_path / "b.txt"))
+    write_input(day, 1, 8, str(tmp_path / "c.txt"))
+
+    a, b, c = ((tmp_path / f"{n}.txt").read_text() for n in "abc")
+    assert a == b
+    assert a != c
+
+
+@pytest.mark.parametrize("day", ["day01", "day04", "day07", "day09"])
+def test_scaling_an_input_scales_the_lines(day, tmp_path):
+    write_input(day, 1, 0, str(tmp_path / "one.txt"))
+    write_input(day, 10, 0, str(tmp_path / "ten.txt"))
+
+    one, ten = (
+        (tmp_path / f"{n}.txt").read_text().splitlines() for n in ("one", "ten")
+    )
+    assert len(ten) == 10 * len(one)
+
+
+def test_the_generated_ghost_paths_give_the_expected_answers(tmp_path):
+    path = str(tmp_path / "input.txt")
+    write_input("day08", 1, 0, path)
+    path_lengths = _distinct_primes_near(NODES // GHOSTS, GHOSTS)
+
+    assert solve_part_one_for_file(path) == path_lengths[0]
+    assert solve_part_two_for_file(path) == math.prod(path_lengths)
@@ -0,0 +1,29 @@
+import pytest
+
+from benchmarks.memory import load_baselines, profile_memory, regression
+from common import DayRegistry
+
+baselines = load_baselines()
+
+
+@pytest.mark.parametrize("solver", DayRegistry().solvers, ids=lambda s: s.name)
+def test_peak_memory_has_not_regressed(solver):
+    if solver.name not in baselines:
+        pytest.skip(f"No memory baseline recorded for {solver.name}")
+
+    profile = profile_memory(solver)
+
+    assert not regression(profile, baselines[solver.name]), (
+        f"{solver.name} peaked at {profile.peak_bytes} bytes "
+        f"against a baseline of {baselines[solver.name]}"
+    )
+
+
+def test_the_biggest_allocation_sites_are_reported():
+    [solver] = [s for s in DayRegistry().solvers_for("day07") if s.part == "one"]
+
+    profile = profile_memory(solver, top=2)
+
+    assert profile.answer == 251806792
+    assert profile.peak_blocks > 0
+    assert len(profile.top_sites) == 2
@@ -1,14 +1,248 @@
 from __future__ import annotations
 
+import bisect
+import contextlib
 import dataclasses
 import functools
-from typing import Iterable, overload
+import importlib
+import itertools
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import (
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    ParamSpec,
+    TypeVar,
+    overload,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+P = ParamSpec("P")
+
+
+READ_BLOCK_SIZE = 1 << 20
+PARALLEL_CHUNK_SIZE = 8 << 20
+PARSE_BATCH_SIZE = 64
 
 
 def read_lines(path: str) -> Iterable[str]:
-    with open(path, "r") as file:
-        while line := file.readline():
-            yield line.strip()
+    return timed_iterable("read", _read_lines(path))
+
+
+def _read_lines(path: str) -> Iterator[str]:
+    for block in _line_aligned_blocks(path):
+        # Decoding straight out of the mapping is the only copy of the text
+        yield from map(str.strip, _split_block(str(block, "utf-8"), "\n"))
+
+
+def read_byte_lines(path: str) -> Iterator[bytes]:
+    for block in _line_aligned_blocks(path):
+        # A memoryview can't be split, so the block is copied once into bytes
+        # first. Each line is a new bytes object either way.
+        yield from map(bytes.strip, _split_block(bytes(block), b"\n"))
+
+
+def read_line_batches(path: str, batch_size: int) -> Iterator[list[bytes]]:
+    if batch_size < 1:
+        raise ValueError("Batches need at least one line in them")
+    lines = read_byte_lines(path)
+    while batch := list(itertools.islice(lines, batch_size)):
+        yield batch
+
+
+def map_reduce_chunks(
+    path: str,
+    chunk_function: Callable[[bytes], T],
+    reducer: Callable[[Iterable[T]], R],
+    *,
+    workers: int | None = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> R:
+    """
+    Splits the file into chunks of whole lines, runs chunk_function over each
+    one in a process pool and reduces the results. chunk_function must be
+    picklable. Files that fit in one chunk never pay for starting a pool.
+    While phases are being recorded the chunks are all run in this process,
+    as phases timed in a worker would never reach the recorder.
+    """
+    workers = workers or os.cpu_count() or 1
+    if _phase_recorder is not None:
+        workers = 1
+    with _mapped_file(path) as mapped:
+        ranges = list(_line_aligned_ranges(mapped, chunk_size))
+        if workers == 1 or len(ranges) <= 1:
+            results = []
+            for start, end in ranges:
+                with phase("read"):
+                    chunk = mapped[start:end]
+                results.append(chunk_function(chunk))
+            return reducer(results)
+    # Only imported once a pool is needed, as it drags in multiprocessing
+    # and that would slow down importing every day
+    from concurrent.futures import ProcessPoolExecutor
+
+    apply = functools.partial(_apply_to_byte_range, path, chunk_function)
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        return reducer(pool.map(apply, ranges))
+
+
+def sum_over_lines(
+    path: str,
+    line_function: Callable[[str], int],
+    *,
+    workers: int | None = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> int:
+    chunk_function: Callable[[bytes], int] = functools.partial(
+        _sum_over_chunk, line_function
+    )
+    total: Callable[[Iterable[int]], int] = sum
+    return map_reduce_chunks(
+        path, chunk_function, total, workers=workers, chunk_size=chunk_size
+    )
+
+
+def sum_over_parsed_lines(
+    path: str,
+    parse_line: Callable[[str], T],
+    value_of: Callable[[T], int],
+    *,
+    workers: int | None = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> int:
+    """
+    sum_over_lines for when parsing should show up as its own phase. Lines
+    are parsed in batches, each inside one parse phase, before their values
+    are worked out, so there's no per line cost for the timing.
+    """
+    chunk_function: Callable[[bytes], int] = functools.partial(
+        _sum_over_parsed_chunk, parse_line, value_of
+    )
+    total: Callable[[Iterable[int]], int] = sum
+    return map_reduce_chunks(
+        path, chunk_function, total, workers=workers, chunk_size=chunk_size
+    )
+
+
+def _sum_over_parsed_chunk(
+    parse_line: Callable[[str], T], value_of: Callable[[T], int], chunk: bytes
+) -> int:
+    with phase("read"):
+        lines = list(map(str.strip, _split_block(chunk.decode(), "\n")))
+    total = 0
+    # Parsing a batch at a time keeps the parsed lines from piling up while
+    # the timing still only costs a phase change per batch
+    for start in range(0, len(lines), PARSE_BATCH_SIZE):
+        with phase("parse"):
+            parsed = list(map(parse_line, lines[start : start + PARSE_BATCH_SIZE]))
+        total += sum(map(value_of, parsed))
+    return total
+
+
+def _sum_over_chunk(line_function: Callable[[str], int], chunk: bytes) -> int:
+    with phase("read"):
+        lines = list(map(str.strip, _split_block(chunk.decode(), "\n")))
+    return sum(map(line_function, lines))
+
+
+def _apply_to_byte_range(
+    path: str, chunk_function: Callable[[bytes], T], byte_range: tuple[int, int]
+) -> T:
+    start, end = byte_range
+    with _mapped_file(path) as mapped:
+        return chunk_function(mapped[start:end])
+
+
+def _line_aligned_blocks(
+    path: str, block_size: int = READ_BLOCK_SIZE
+) -> Iterator[memoryview]:
+    # Hands out roughly block_size chunks of the file, always cut just after a
+    # newline, so the per line work can happen in bulk rather than a readline at a time.
+    # Blocks are views of the mapping rather than copies of it, and each is
+    # released as soon as the next one is asked for, so they can't outlive it.
+    with _mapped_file(path) as mapped, memoryview(mapped) as view:
+        for start, end in _line_aligned_ranges(mapped, block_size):
+            with view[start:end] as block:
+                yield block
+
+
+@contextlib.contextmanager
+def _mapped_file(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as file:
+        # mmap refuses to map an empty file
+        if file.seek(0, 2) == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped  # type: ignore
+
+
+def _line_aligned_ranges(mapped: bytes, block_size: int) -> Iterator[tuple[int, int]]:
+    start = 0
+    size = len(mapped)
+    while start < size:
+        end = mapped.find(b"\n", min(start + block_size, size) - 1) + 1
+        if end == 0:
+            end = size
+        yield start, end
+        start = end
+
+
+@overload
+def _split_block(block: str, newline: str) -> list[str]:
+    ...
+
+
+@overload
+def _split_block(block: bytes, newline: bytes) -> list[bytes]:
+    ...
+
+
+def _split_block(block, newline):
+    lines = block.split(newline)
+    # A block ending in a newline leaves an empty string behind which isn't a line
+    if lines[-1] == block[0:0]:
+        lines.pop()
+    return lines
+
+
+# Clears every cache made by cached_per_file
+_file_cache_clearers: list[Callable[[], None]] = []
+
+
+def cached_per_file(function: Callable[[str], R]) -> Callable[[str], R]:
+    """
+    Keeps what function works out from a file for as long as the file's
+    mtime and size stay the same, so both parts of a day can share one
+    parse. clear_file_caches drops everything cached this way, and the
+    timing and memory tools call it before every run they measure.
+    """
+
+    @functools.lru_cache(maxsize=1)
+    def cached(path: str, _mtime_ns: int, _size: int) -> R:
+        return function(path)
+
+    _file_cache_clearers.append(cached.cache_clear)
+
+    @functools.wraps(function)
+    def wrapper(path: str) -> R:
+        stat = os.stat(path)
+        return cached(path, stat.st_mtime_ns, stat.st_size)
+
+    return wrapper
+
+
+def clear_file_caches():
+    for clear in _file_cache_clearers:
+        clear()
 
 
 def blocks_by_blank_line(lines: Iterable[str]) -> Iterable[list[str]]:
@@ -40,7 +274,7 @@ def iterator_length(ns: Iterable) -> int:
     return sum(1 for _ in ns)
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class IntRange(Iterable[int]):
     start: int
     stop: int
@@ -49,8 +283,333 @@ class IntRange(Iterable[int]):
         return iter(range(self.start, self.stop))
 
     def __len__(self) -> int:
-        return self.stop - self.start
+        return max(self.stop - self.start, 0)
+
+    def __contains__(self, value: object) -> bool:
+        return isinstance(value, int) and self.start <= value < self.stop
+
+    def __or__(self, other: IntRange | IntervalSet) -> IntervalSet:
+        return IntervalSet([self]) | other
+
+    def __and__(self, other: IntRange | IntervalSet) -> IntervalSet:
+        return IntervalSet([self]) & other
+
+    def __sub__(self, other: IntRange | IntervalSet) -> IntervalSet:
+        return IntervalSet([self]) - other
 
     @classmethod
     def empty(cls) -> IntRange:
         return IntRange(start=0, stop=0)
+
+
+class IntervalSet(Iterable[int]):
+    """
+    A set of ints held as sorted, non overlapping half open ranges. The
+    boundaries live in one flat array - [start, stop, start, stop, ...] - so
+    a set of a million ranges is two million machine ints rather than a
+    million IntRange objects. An IntRange is the single range case.
+    """
+
+    __slots__ = ("_bounds",)
+    _bounds: array
+
+    def __init__(self, ranges: Iterable[IntRange] = ()):
+        self._bounds = array("q")
+        for int_range in sorted(ranges, key=lambda r: r.start):
+            if int_range.start >= int_range.stop:
+                continue
+            # Coalesce anything overlapping or touching the last range
+            if self._bounds and int_range.start <= self._bounds[-1]:
+                self._bounds[-1] = max(self._bounds[-1], int_range.stop)
+            else:
+                self._bounds.append(int_range.start)
+                self._bounds.append(int_range.stop)
+
+    @classmethod
+    def _from_bounds(cls, bounds: array) -> IntervalSet:
+        interval_set = cls()
+        interval_set._bounds = bounds
+        return interval_set
+
+    def ranges(self) -> Iterator[IntRange]:
+        bounds = self._bounds
+        for i in range(0, len(bounds), 2):
+            yield IntRange(start=bounds[i], stop=bounds[i + 1])
+
+    @property
+    def range_count(self) -> int:
+        return len(self._bounds) // 2
+
+    def min(self) -> int:
+        if not self._bounds:
+            raise ValueError("An empty interval set has no minimum")
+        return self._bounds[0]
+
+    def max(self) -> int:
+        if not self._bounds:
+            raise ValueError("An empty interval set has no maximum")
+        return self._bounds[-1] - 1
+
+    def __contains__(self, value: object) -> bool:
+        # Inside a range exactly when an odd number of boundaries are <= value
+        return (
+            isinstance(value, int) and bisect.bisect_right(self._bounds, value) % 2 == 1
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        for int_range in self.ranges():
+            yield from int_range
+
+    def __len__(self) -> int:
+        bounds = self._bounds
+        return sum(bounds[i + 1] - bounds[i] for i in range(0, len(bounds), 2))
+
+    def __bool__(self) -> bool:
+        return bool(self._bounds)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IntRange):
+            other = IntervalSet([other])
+        return isinstance(other, IntervalSet) and self._bounds == other._bounds
+
+    def __repr__(self) -> str:
+        ranges = ", ".join(f"[{r.start}, {r.stop})" for r in self.ranges())
+        return f"IntervalSet({ranges})"
+
+    def __or__(self, other: IntRange | IntervalSet) -> IntervalSet:
+        return self._combine(other, lambda in_self, in_other: in_self or in_other)
+
+    def __and__(self, other: IntRange | IntervalSet) -> IntervalSet:
+        return self._combine(other, lambda in_self, in_other: in_self and in_other)
+
+    def __sub__(self, other: IntRange | IntervalSet) -> IntervalSet:
+        return self._combine(other, lambda in_self, in_other: in_self and not in_other)
+
+    union = __or__
+    intersection = __and__
+    difference = __sub__
+
+    def _combine(
+        self, other: IntRange | IntervalSet, keep: Callable[[bool, bool], bool]
+    ) -> IntervalSet:
+        # A single sweep over both sets of boundaries, tracking whether we're
+        # currently inside each one and emitting a boundary whenever the
+        # combined answer flips.
+        a = self._bounds
+        b = (
+            other._bounds
+            if isinstance(other, IntervalSet)
+            else IntervalSet([other])._bounds
+        )
+        result = array("q")
+        i = j = 0
+        inside = False
+        while i < len(a) or j < len(b):
+            point = min(a[i] if i < len(a) else b[j], b[j] if j < len(b) else a[i])
+            while i < len(a) and a[i] == point:
+                i += 1
+            while j < len(b) and b[j] == point:
+                j += 1
+            now_inside = keep(i % 2 == 1, j % 2 == 1)
+            if now_inside != inside:
+                result.append(point)
+                inside = now_inside
+        return IntervalSet._from_bounds(result)
+
+
+day_directory = re.compile(r"day\d\d")
+part_module = re.compile(r"part_([a-z]+(?:_and_[a-z]+)*)\.py")
+
+PART_ORDER = ("one", "two")
+
+# How long each solver module took to import, in nanoseconds
+import_times_ns: dict[str, int] = {}
+
+
+@dataclasses.dataclass(frozen=True)
+class Solver:
+    day: str
+    part: str
+    module: str
+    function: str
+    # Where the day directories live, which is src unless a registry was
+    # pointed somewhere else
+    source_dir: Path = Path("./src")
+
+    @property
+    def name(self) -> str:
+        return f"{self.day} part {self.part}"
+
+    @property
+    def source_path(self) -> Path:
+        return self.source_dir.joinpath(*self.module.split(".")).with_suffix(".py")
+
+    @property
+    def input_path(self) -> Path:
+        return self.source_dir / self.day / "input.txt"
+
+    def load(self) -> Callable[[], object]:
+        return getattr(import_solver_module(self.module), self.function)
+
+    def __call__(self) -> object:
+        return self.load()()
+
+
+class DayRegistry:
+    """
+    Knows which days and parts exist purely from the file names under
+    source_dir. Nothing from a day is imported until one of its solvers is loaded.
+    """
+
+    source_dir: Path
+
+    def __init__(self, source_dir: str = "./src"):
+        self.source_dir = Path(source_dir)
+
+    @functools.cached_property
+    def solvers(self) -> list[Solver]:
+        solvers = []
+        for day_path in self.source_dir.iterdir():
+            if not day_directory.fullmatch(day_path.name):
+                continue
+            for module_path in day_path.iterdir():
+                if not (match := part_module.fullmatch(module_path.name)):
+                    continue
+                for part in match.group(1).split("_and_"):
+                    solvers.append(
+                        Solver(
+                            day=day_path.name,
+                            part=part,
+                            module=f"{day_path.name}.{module_path.stem}",
+                            function=f"solve_part_{part}",
+                            source_dir=self.source_dir,
+                        )
+                    )
+        return sorted(solvers, key=_solver_order)
+
+    @property
+    def days(self) -> list[str]:
+        return sorted({solver.day for solver in self.solvers})
+
+    def solvers_for(self, day: str) -> list[Solver]:
+        return [solver for solver in self.solvers if solver.day == day]
+
+
+def import_solver_module(module_name: str):
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    start = time.perf_counter_ns()
+    module = importlib.import_module(module_name)
+    import_times_ns[module_name] = time.perf_counter_ns() - start
+    return module
+
+
+def import_times_by_day() -> dict[str, int]:
+    totals: dict[str, int] = {}
+    for module_name, taken in import_times_ns.items():
+        day = module_name.split(".")[0]
+        totals[day] = totals.get(day, 0) + taken
+    return totals
+
+
+def _solver_order(solver: Solver) -> tuple[str, int]:
+    part = PART_ORDER.index(solver.part) if solver.part in PART_ORDER else 99
+    return solver.day, part
+
+
+class PhaseRecorder:
+    """
+    Adds up nanoseconds spent in each named phase. Phases nest and the time
+    is only counted against the innermost one, so reading lines lazily from
+    inside a parse still shows up as reading.
+    """
+
+    totals_ns: dict[str, int]
+    _stack: list[list]
+
+    def __init__(self):
+        self.totals_ns = {}
+        self._stack = []
+
+    def enter(self, name: str):
+        now = time.perf_counter_ns()
+        if self._stack:
+            parent, started = self._stack[-1]
+            self._add(parent, started, now)
+        self._stack.append([name, now])
+
+    def exit(self):
+        now = time.perf_counter_ns()
+        name, started = self._stack.pop()
+        self._add(name, started, now)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def _add(self, name: str, started: int, now: int):
+        self.totals_ns[name] = self.totals_ns.get(name, 0) + now - started
+
+
+# Only set while phases are being recorded. Everything below checks it first so
+# instrumented code costs next to nothing the rest of the time.
+_phase_recorder: PhaseRecorder | None = None
+_not_recording = contextlib.nullcontext()
+
+
+@contextlib.contextmanager
+def recording_phases() -> Iterator[dict[str, int]]:
+    global _phase_recorder
+    previous = _phase_recorder
+    _phase_recorder = PhaseRecorder()
+    try:
+        yield _phase_recorder.totals_ns
+    finally:
+        _phase_recorder = previous
+
+
+def phase(name: str) -> ContextManager:
+    if _phase_recorder is None:
+        return _not_recording
+    return _phase_recorder.phase(name)
+
+
+def timed_phase(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    def decorator(function: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _phase_recorder is None:
+                return function(*args, **kwargs)
+            with _phase_recorder.phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def timed_iterable(name: str, iterable: Iterable[T]) -> Iterable[T]:
+    # Charges the time taken to produce each item to the phase
+    if _phase_recorder is None:
+        return iterable
+    return _timed_iterator(_phase_recorder, name, iter(iterable))
+
+
+def _timed_iterator(
+    recorder: PhaseRecorder, name: str, iterator: Iterator[T]
+) -> Iterator[T]:
+    while True:
+        recorder.enter(name)
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            recorder.exit()
+        yield item
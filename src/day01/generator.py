@@ -0,0 +1,25 @@
+from random import Random
+from typing import Iterator
+
+from .part_two import number_words
+
+# Lines in the real input.txt
+LINES = 1000
+
+_letters = "abcdefghijklmnopqrstuvwxyz"
+
+
+def generate(scale: int, seed: int = 0) -> Iterator[str]:
+    random = Random(seed)
+    for _ in range(LINES * scale):
+        pieces = [random.choice("123456789")]
+        for _ in range(random.randint(1, 6)):
+            match random.randint(0, 2):
+                case 0:
+                    pieces.append(random.choice("123456789"))
+                case 1:
+                    pieces.append(random.choice(number_words)[0])
+                case 2:
+                    pieces.append("".join(random.choices(_letters, k=3)))
+        random.shuffle(pieces)
+        yield "".join(pieces)
@@ -1,9 +1,12 @@
 from typing import Iterable
 
-from common import read_lines
+from common import map_reduce_chunks
 
 CharSequence = str | Iterable[str]
 
+# Everything but the ascii digits and the newlines that separate the lines
+_not_digits = bytes(b for b in range(256) if b not in b"0123456789\n")
+
 
 def find_first_number(input_chars: CharSequence) -> str:
     for char in input_chars:
@@ -21,4 +24,29 @@ def number_for_input(input_chars: str) -> int:
 
 
 def solve_part_one() -> int:
-    return sum(number_for_input(line) for line in read_lines("./src/day01/input.txt"))
+    return solve_part_one_for_file("./src/day01/input.txt")
+
+
+def sum_calibration_values(data: bytes) -> int:
+    """
+    Does number_for_input for every line of data in bulk. Deleting every byte
+    that isn't a digit or a newline leaves just the digits of each line, so
+    the first digits are the ones straight after a newline and the last digits
+    the ones straight before. Counting those pairs is all that's left, which
+    happens in C without making an object per line, let alone per character.
+    """
+    digits = b"\n" + data.translate(None, _not_digits)
+    if not digits.endswith(b"\n"):
+        digits += b"\n"
+    if b"\n\n" in digits:
+        raise RuntimeError("No number found")
+    total = 0
+    for value, digit in enumerate(b"0123456789"):
+        first = digits.count(bytes([10, digit]))
+        last = digits.count(bytes([digit, 10]))
+        total += value * (10 * first + last)
+    return total
+
+
+def solve_part_one_for_file(file_path: str) -> int:
+    return map_reduce_chunks(file_path, sum_calibration_values, sum)
@@ -1,6 +1,8 @@
+from collections import deque
+from functools import cache
 from typing import Iterable
 
-from common import read_lines
+from common import sum_over_lines
 
 CharSequence = str | Iterable[str]
 
@@ -19,16 +21,70 @@ number_words = (
 reversed_number_words = tuple((x[::-1], y) for x, y in number_words)
 
 
-def find_first_number(input_chars: CharSequence, *, word_lookup=number_words) -> str:
-    working_string = ""
-    for char in input_chars:
-        if char.isdigit():
-            return char
-        working_string += char
-        for number_word, value in word_lookup:
-            if number_word in working_string:
+class NumberMatcher:
+    """
+    An Aho-Corasick automaton over the digits and the number words. Feeding it
+    one character at a time finds whichever number finishes first in a single
+    pass, without ever looking back over what's been read.
+    """
+
+    _transitions: list[dict[str, int]]
+    _values: list[str | None]
+
+    def __init__(self, word_lookup: Iterable[tuple[str, str]]):
+        patterns = [*word_lookup, *((digit, digit) for digit in "0123456789")]
+        children: list[dict[str, int]] = [{}]
+        self._values = [None]
+        for word, value in patterns:
+            state = 0
+            for char in word:
+                if char not in children[state]:
+                    children.append({})
+                    self._values.append(None)
+                    children[state][char] = len(children) - 1
+                state = children[state][char]
+            self._values[state] = value
+
+        # Breadth first so every fallback is finished before it's needed. Each
+        # state ends up with a complete transition for every char it could see.
+        self._transitions = [{} for _ in children]
+        fallbacks = [0] * len(children)
+        self._transitions[0] = dict(children[0])
+        queue = deque(children[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = fallbacks[state]
+            if self._values[state] is None:
+                self._values[state] = self._values[fallback]
+            self._transitions[state] = {
+                **self._transitions[fallback],
+                **children[state],
+            }
+            for char, child in children[state].items():
+                fallbacks[child] = self._transitions[fallback].get(char, 0)
+                queue.append(child)
+
+    def first_match(self, input_chars: CharSequence) -> str | None:
+        transitions = self._transitions
+        values = self._values
+        state = 0
+        for char in input_chars:
+            state = transitions[state].get(char, 0)
+            if (value := values[state]) is not None:
                 return value
-    raise RuntimeError("No number found")
+        return None
+
+
+@cache
+def _matcher_for(word_lookup: tuple[tuple[str, str], ...]) -> NumberMatcher:
+    return NumberMatcher(word_lookup)
+
+
+def find_first_number(input_chars: CharSequence, *, word_lookup=number_words) -> str:
+    value = _matcher_for(word_lookup).first_match(input_chars)
+    if value is None:
+        raise RuntimeError("No number found")
+    return value
 
 
 def find_last_number(input_chars: str) -> str:
@@ -40,4 +96,8 @@ def number_for_input(input_chars: str) -> int:
 
 
 def solve_part_two():
-    return sum(number_for_input(line) for line in read_lines("./src/day01/input.txt"))
+    return solve_part_two_for_file("./src/day01/input.txt")
+
+
+def solve_part_two_for_file(file_path: str) -> int:
+    return sum_over_lines(file_path, number_for_input)
@@ -1,5 +1,8 @@
+import pytest
+
 from .part_one import (
     find_first_number,
+    sum_calibration_values,
     find_last_number,
     number_for_input,
     solve_part_one,
@@ -20,3 +23,17 @@ def test_it_can_build_the_number_for_a_string():
 
 def test_it_solves_the_problem():
     assert solve_part_one() == 55002
+
+
+def test_a_whole_buffer_can_be_summed_at_once():
+    lines = ["1abc2", "pqr3stu8vwx", "a1b2c3d4e5f", "treb7uchet"]
+    data = "\n".join(lines).encode()
+
+    assert sum_calibration_values(data) == 142
+    assert sum_calibration_values(data + b"\n") == 142
+    assert sum_calibration_values(data) == sum(number_for_input(l) for l in lines)
+
+
+def test_the_whole_buffer_sum_still_needs_a_number_on_every_line():
+    with pytest.raises(RuntimeError):
+        sum_calibration_values(b"1abc2\nnothing here\n")
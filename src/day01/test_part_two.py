@@ -28,3 +28,13 @@ def test_it_can_build_the_number_for_a_string():
 
 def test_it_solves_the_problem():
     assert solve_part_two() == 55093
+
+
+def test_overlapping_number_words_are_both_found():
+    assert number_for_input("xtwonex") == 21
+    assert number_for_input("eighthree") == 83
+
+
+def test_a_near_miss_does_not_hide_the_next_word():
+    assert find_first_number("ninine") == "9"
+    assert find_last_number("sevenineigh") == "9"
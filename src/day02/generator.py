@@ -0,0 +1,15 @@
+from random import Random
+from typing import Iterator
+
+# Lines in the real input.txt
+LINES = 100
+
+
+def generate(scale: int, seed: int = 0) -> Iterator[str]:
+    random = Random(seed)
+    for game_id in range(1, LINES * scale + 1):
+        draws = []
+        for _ in range(random.randint(1, 6)):
+            colors = random.sample(["red", "green", "blue"], random.randint(1, 3))
+            draws.append(", ".join(f"{random.randint(1, 20)} {c}" for c in colors))
+        yield f"Game {game_id}: {'; '.join(draws)}"
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import bisect
 import dataclasses
+import itertools
+import re
+from array import array
 from enum import Enum
-from typing import Collection, Mapping
+from typing import Collection, Iterable, Mapping
 
-from common import read_lines
+from common import cached_per_file, map_reduce_chunks, timed_phase
 
 
 class Color(str, Enum):
@@ -69,18 +73,169 @@ def biggest_draw_possible(draws: Collection[Draw]) -> Draw:
     return Draw(cubes=highest)
 
 
-def solve_part_one() -> int:
-    lines = read_lines("./src/day02/input.txt")
-    games = (parse_line(line) for line in lines)
-    possible_games = (
-        game
-        for game in games
-        if game.is_possible_from({Color.red: 12, Color.green: 13, Color.blue: 14})
+# game id, then the most red, green and blue cubes seen in any one draw
+GameMaxima = tuple[int, int, int, int]
+
+_cube_count = re.compile(r"(\d+) (r|g|b)")
+
+
+def parse_maxima(line: str) -> GameMaxima:
+    """
+    Reduces a line straight down to its biggest draw without building any
+    Game, Draw or Color objects along the way.
+    """
+    game_part, draw_part = line.split(": ")
+    most = {"r": 0, "g": 0, "b": 0}
+    for raw_number, color in _cube_count.findall(draw_part):
+        number = int(raw_number)
+        if number > most[color]:
+            most[color] = number
+    return int(game_part[5:]), most["r"], most["g"], most["b"]
+
+
+def is_possible(maxima: GameMaxima, cube_collection: CubeCollection) -> bool:
+    # Like Draw.is_possible_from, a bag missing any colour fits no game at all
+    if not all(color in cube_collection for color in Color):
+        return False
+    _, red, green, blue = maxima
+    return (
+        red <= cube_collection[Color.red]
+        and green <= cube_collection[Color.green]
+        and blue <= cube_collection[Color.blue]
     )
-    return sum(game.game_id for game in possible_games)
+
+
+def power_of(maxima: GameMaxima) -> int:
+    _, red, green, blue = maxima
+    return red * green * blue
+
+
+@cached_per_file
+def game_maxima_for_file(file_path: str) -> list[GameMaxima]:
+    # Both parts want the same parse of the same file
+    return map_reduce_chunks(file_path, _maxima_in_chunk, _concatenate)
+
+
+@timed_phase("parse")
+def _maxima_in_chunk(chunk: bytes) -> list[GameMaxima]:
+    return [parse_maxima(line) for line in chunk.decode().splitlines() if line]
+
+
+def _concatenate(results: Iterable[list[GameMaxima]]) -> list[GameMaxima]:
+    return list(itertools.chain.from_iterable(results))
+
+
+class GameLog:
+    """
+    The colour maxima of every game held column by column, plus a dominance
+    index answering "which games fit in this bag" without looking at the games.
+
+    The index is a table over every (red, green, blue) maximum that occurs,
+    where each cell holds the id and power totals of all the games that fit
+    inside it. A bag query then only needs three bisects and one lookup.
+    """
+
+    MAX_INDEX_CELLS = 1 << 22
+
+    ids: array
+    reds: array
+    greens: array
+    blues: array
+
+    def __init__(self, games: Iterable[GameMaxima]):
+        self.ids, self.reds, self.greens, self.blues = (array("q") for _ in range(4))
+        for game_id, red, green, blue in games:
+            self.ids.append(game_id)
+            self.reds.append(red)
+            self.greens.append(green)
+            self.blues.append(blue)
+        self._axes = tuple(
+            sorted(set(column)) for column in (self.reds, self.greens, self.blues)
+        )
+        self._id_totals, self._power_totals = self._build_index()
+
+    @classmethod
+    def from_file(cls, file_path: str) -> GameLog:
+        return cls(game_maxima_for_file(file_path))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def feasibility(self, bags: Iterable[CubeCollection]) -> list[tuple[int, int]]:
+        """
+        For each bag the sum of the ids and the sum of the powers of the games
+        that bag could have played.
+        """
+        if self._id_totals is None:
+            return [self._scan(bag) for bag in bags]
+        return [self._lookup(bag) for bag in bags]
+
+    def _lookup(self, bag: CubeCollection) -> tuple[int, int]:
+        assert self._id_totals is not None and self._power_totals is not None
+        # As with is_possible, a bag missing a colour fits no games
+        if not all(color in bag for color in Color):
+            return 0, 0
+        cell = 0
+        for axis, color in zip(self._axes, (Color.red, Color.green, Color.blue)):
+            position = bisect.bisect_right(axis, bag[color]) - 1
+            if position < 0:
+                return 0, 0
+            cell = cell * len(axis) + position
+        return self._id_totals[cell], self._power_totals[cell]
+
+    def _scan(self, bag: CubeCollection) -> tuple[int, int]:
+        fits = [
+            (game_id, red * green * blue)
+            for game_id, red, green, blue in zip(
+                self.ids, self.reds, self.greens, self.blues
+            )
+            if is_possible((game_id, red, green, blue), bag)
+        ]
+        return sum(i for i, _ in fits), sum(p for _, p in fits)
+
+    def _build_index(self) -> tuple[array | None, array | None]:
+        red_axis, green_axis, blue_axis = self._axes
+        shape = (len(red_axis), len(green_axis), len(blue_axis))
+        cells = shape[0] * shape[1] * shape[2]
+        if cells == 0 or cells > self.MAX_INDEX_CELLS:
+            return None, None
+        ids = array("q", bytes(8 * cells))
+        powers = array("q", bytes(8 * cells))
+        red_index, green_index, blue_index = (
+            {value: n for n, value in enumerate(axis)} for axis in self._axes
+        )
+        for game_id, red, green, blue in zip(
+            self.ids, self.reds, self.greens, self.blues
+        ):
+            cell = (red_index[red] * shape[1] + green_index[green]) * shape[
+                2
+            ] + blue_index[blue]
+            ids[cell] += game_id
+            powers[cell] += red * green * blue
+        # A running total along each axis in turn leaves every cell holding
+        # the totals for everything at or below it on all three
+        strides = (shape[1] * shape[2], shape[2], 1)
+        for axis_length, stride in zip(shape, strides):
+            for cell in range(cells):
+                if (cell // stride) % axis_length:
+                    ids[cell] += ids[cell - stride]
+                    powers[cell] += powers[cell - stride]
+        return ids, powers
+
+
+def solve_part_one() -> int:
+    return solve_part_one_for_file("./src/day02/input.txt")
 
 
 def solve_part_two() -> int:
-    lines = read_lines("./src/day02/input.txt")
-    games = (parse_line(line) for line in lines)
-    return sum(game.power for game in games)
+    return solve_part_two_for_file("./src/day02/input.txt")
+
+
+def solve_part_one_for_file(file_path: str) -> int:
+    bag = {Color.red: 12, Color.green: 13, Color.blue: 14}
+    games = game_maxima_for_file(file_path)
+    return sum(maxima[0] for maxima in games if is_possible(maxima, bag))
+
+
+def solve_part_two_for_file(file_path: str) -> int:
+    return sum(power_of(maxima) for maxima in game_maxima_for_file(file_path))
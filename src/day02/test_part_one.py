@@ -1,3 +1,5 @@
+from random import Random
+
 from day02.part_one_and_two import (
     Color,
     Draw,
@@ -5,6 +7,9 @@ from day02.part_one_and_two import (
     biggest_draw_possible,
     Game,
     solve_part_one,
+    parse_maxima,
+    is_possible,
+    GameLog,
 )
 
 
@@ -68,3 +73,71 @@ def test_it_can_indicate_if_a_game_is_possible_from_a_collection():
 
 def test_it_can_solve_part_one():
     assert solve_part_one() == 2771
+
+
+def test_a_line_can_be_reduced_straight_to_its_biggest_draw():
+    assert parse_maxima("Game 34: 3 blue, 4 red; 1 green; 7 red, 2 blue") == (
+        34,
+        7,
+        1,
+        3,
+    )
+
+
+def test_the_maxima_tell_if_a_game_is_possible():
+    maxima = parse_maxima("Game 13: 4 red, 3 blue; 6 red, 2 blue; 1 green")
+
+    assert is_possible(maxima, {Color.green: 10, Color.blue: 10, Color.red: 10})
+    assert not is_possible(maxima, {Color.green: 10, Color.blue: 10, Color.red: 5})
+    assert not is_possible(maxima, {Color.blue: 10, Color.red: 10})
+
+
+def test_the_maxima_agree_with_the_game_when_the_bag_lacks_a_colour():
+    line = "Game 13: 4 red, 3 blue; 6 red, 2 blue"
+    bag = {Color.blue: 10, Color.red: 10}
+
+    assert not parse_line(line).is_possible_from(bag)
+    assert not is_possible(parse_maxima(line), bag)
+
+
+def test_a_game_log_answers_many_bags_at_once():
+    log = GameLog(
+        [
+            parse_maxima("Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green"),
+            parse_maxima("Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red"),
+            parse_maxima("Game 3: 8 green, 6 blue, 20 red; 5 blue, 4 red, 13 green"),
+        ]
+    )
+
+    assert log.feasibility(
+        [
+            {Color.red: 12, Color.green: 13, Color.blue: 14},
+            {Color.red: 20, Color.green: 13, Color.blue: 6},
+            {Color.red: 0, Color.green: 13, Color.blue: 14},
+            {Color.red: 4, Color.green: 3, Color.blue: 6},
+            {Color.red: 20, Color.green: 13},
+        ]
+    ) == [
+        (1 + 2, 48 + 12),
+        (1 + 2 + 3, 48 + 12 + 1560),
+        (0, 0),
+        (1 + 2, 48 + 12),
+        (0, 0),
+    ]
+
+
+def test_the_game_log_index_agrees_with_scanning_every_game():
+    class UnindexedGameLog(GameLog):
+        MAX_INDEX_CELLS = 0
+
+    games = GameLog.from_file("./src/day02/input.txt")
+    unindexed = UnindexedGameLog.from_file("./src/day02/input.txt")
+    random = Random(2)
+    bags = [{color: random.randint(0, 21) for color in Color} for _ in range(200)]
+    bags += [{Color.red: 21, Color.green: 21}, {}]
+
+    assert games.feasibility(bags) == unindexed.feasibility(bags)
+    assert (
+        games.feasibility([{Color.red: 12, Color.green: 13, Color.blue: 14}])[0][0]
+        == solve_part_one()
+    )
@@ -3,6 +3,8 @@ from day02.part_one_and_two import (
     Draw,
     Game,
     solve_part_two,
+    parse_maxima,
+    power_of,
 )
 
 
@@ -22,3 +24,9 @@ def test_it_can_get_the_power_of_a_game():
 
 def test_it_can_solve_part_two():
     assert solve_part_two() == 70924
+
+
+def test_the_power_comes_from_the_maxima():
+    assert power_of(parse_maxima("Game 13: 4 red, 3 blue; 6 red, 2 blue; 2 green")) == (
+        6 * 3 * 2
+    )
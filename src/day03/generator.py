@@ -0,0 +1,26 @@
+from random import Random
+from typing import Iterator
+
+# Rows in the real input.txt - the width stays the same at every scale
+LINES = 140
+WIDTH = 140
+
+_symbols = "*#+$/@=%&-"
+
+
+def generate(scale: int, seed: int = 0) -> Iterator[str]:
+    random = Random(seed)
+    for _ in range(LINES * scale):
+        row = ""
+        while len(row) < WIDTH:
+            roll = random.random()
+            space_left = WIDTH - len(row)
+            if roll < 0.1:
+                digits = min(random.randint(1, 3), space_left)
+                # A dot after each number stops it running into the next one
+                row += str(random.randint(10 ** (digits - 1), 10**digits - 1)) + "."
+            elif roll < 0.15:
+                row += random.choice(_symbols)
+            else:
+                row += "."
+        yield row[:WIDTH]
@@ -1,7 +1,9 @@
 import dataclasses
-from typing import Iterator, Sequence, Mapping, Iterable, TypeGuard
+import re
+from bisect import bisect_left, bisect_right
+from typing import Iterator, Sequence, Mapping, Iterable
 
-from common import read_lines
+from common import read_lines, timed_phase
 
 PartLocationId = int
 PartNumber = int
@@ -12,74 +14,301 @@ Grid = Sequence[Sequence[SchematicCell]]
 Position = tuple[int, int]
 
 
+@dataclasses.dataclass(slots=True)
+class PartSpan:
+    row: int
+    x_start: int
+    x_end: int
+    value: PartNumber
+    mask: int = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.mask = ((1 << (self.x_end - self.x_start)) - 1) << self.x_start
+
+
+@dataclasses.dataclass
+class PartSpanRow:
+    """The part spans of one row, in column order, ready for interval lookups"""
+
+    starts: list[int] = dataclasses.field(default_factory=list)
+    ends: list[int] = dataclasses.field(default_factory=list)
+    spans: list[PartSpan] = dataclasses.field(default_factory=list)
+
+    def add(self, span: PartSpan):
+        self.starts.append(span.x_start)
+        self.ends.append(span.x_end)
+        self.spans.append(span)
+
+    def overlapping(self, x_start: int, x_end: int) -> list[PartSpan]:
+        return self.spans[
+            bisect_right(self.ends, x_start) : bisect_left(self.starts, x_end)
+        ]
+
+
 @dataclasses.dataclass
 class Schematic:
     grid: Grid
     part_lookup: Mapping[PartLocationId, PartNumber]
+    # Indexes built while parsing. A schematic made by hand without them has
+    # them worked out from its grid instead.
+    symbol_index: dataclasses.InitVar[dict[Symbol, list[Position]] | None] = None
+    span_index: dataclasses.InitVar[dict[int, PartSpanRow] | None] = None
+    symbol_positions: dict[Symbol, list[Position]] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    part_rows: dict[int, PartSpanRow] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(
+        self,
+        symbol_index: dict[Symbol, list[Position]] | None,
+        span_index: dict[int, PartSpanRow] | None,
+    ):
+        if symbol_index is None or span_index is None:
+            symbol_index, span_index = _index_grid(self.grid, self.part_lookup)
+        self.symbol_positions = symbol_index
+        self.part_rows = span_index
+
+    def parts_adjacent_to(
+        self, symbols: Iterable[Symbol]
+    ) -> dict[Position, list[PartSpan]]:
+        """
+        Every position holding one of the symbols, with the part spans that
+        touch it, found from the indexes rather than the grid.
+        """
+        adjacent = {}
+        for symbol in symbols:
+            for x, y in self.symbol_positions.get(symbol, ()):
+                adjacent[x, y] = [
+                    span
+                    for row in range(y - 1, y + 2)
+                    if row in self.part_rows
+                    for span in self.part_rows[row].overlapping(x - 1, x + 2)
+                ]
+        return adjacent
+
+    def get_part_numbers_next_to_symbol(self) -> list[PartNumber]:
+        touching = {
+            (span.row, span.x_start): span.value
+            for spans in self.parts_adjacent_to(self.symbol_positions).values()
+            for span in spans
+        }
+        return [touching[key] for key in sorted(touching)]
+
+    def get_gears(self) -> Iterable[tuple[PartNumber, PartNumber]]:
+        for spans in self.parts_adjacent_to("*").values():
+            if len(spans) == 2:
+                yield spans[0].value, spans[1].value
+
+
+@dataclasses.dataclass
+class BitmaskSchematic:
+    """
+    The schematic as one int per row, with bit x set when column x holds a
+    symbol, alongside the span of every part number. Adjacency is then a
+    handful of shifts and ANDs per row rather than a probe per cell.
+    """
+
+    symbol_rows: list[int]
+    gear_rows: list[int]
+    part_rows: list[list[PartSpan]]
 
     def get_part_numbers_next_to_symbol(self) -> list[PartNumber]:
-        part_location_ids: set[PartLocationId] = set()
-        for piece, position in self._pieces(pick_if=is_symbol):
-            neighbours = get_neighbours(self.grid, position)
-            for neighbour in neighbours:
-                if is_part_location(neighbour) and neighbour in self.part_lookup:
-                    part_location_ids.add(neighbour)
-        return [self.part_lookup[location_id] for location_id in part_location_ids]
+        reach = dilate(self.symbol_rows)
+        return [
+            part.value
+            for y, parts in enumerate(self.part_rows)
+            for part in parts
+            if part.mask & reach[y]
+        ]
 
     def get_gears(self) -> Iterable[tuple[PartNumber, PartNumber]]:
-        for piece, position in self._pieces(pick_if=is_gear_symbol):
-            part_number_neighbours = get_part_number_neighbours(self.grid, position)
-            if len(part_number_neighbours) == 2:
-                yield tuple(self.part_lookup[x] for x in part_number_neighbours)  # type: ignore
+        for y, gears in enumerate(self.gear_rows):
+            yield from gears_in_row(gears, self.part_rows[max(y - 1, 0) : y + 2])
+
+
+def spread(row: int) -> int:
+    return row | row << 1 | row >> 1
+
 
-    def _pieces(
-        self, *, pick_if=lambda piece: True
-    ) -> Iterable[tuple[SchematicCell, Position]]:
-        for y in range(0, len(self.grid)):
-            for x in range(0, len(self.grid[0])):
-                piece = self.grid[y][x]
-                if pick_if(piece):
-                    yield piece, (x, y)
+def gears_in_row(
+    gears: int, nearby_rows: Iterable[Sequence[PartSpan]]
+) -> Iterator[tuple[PartNumber, PartNumber]]:
+    if not gears:
+        return
+    row_reach = spread(gears)
+    nearby_parts = [
+        part for parts in nearby_rows for part in parts if part.mask & row_reach
+    ]
+    while gears:
+        gear = gears & -gears
+        gears ^= gear
+        reach = spread(gear)
+        touching = [part.value for part in nearby_parts if part.mask & reach]
+        if len(touching) == 2:
+            yield touching[0], touching[1]
 
 
-def is_symbol(piece: SchematicCell) -> TypeGuard[Symbol]:
-    if isinstance(piece, PartLocationId):
-        return False
-    if piece == ".":
-        return False
-    return True
+def dilate(rows: Sequence[int]) -> list[int]:
+    """Grow every set bit to cover its 3x3 neighbourhood"""
+    spreads = [spread(row) for row in rows]
+    return [
+        spreads[y]
+        | (spreads[y - 1] if y > 0 else 0)
+        | (spreads[y + 1] if y + 1 < len(spreads) else 0)
+        for y in range(len(spreads))
+    ]
 
 
-def is_gear_symbol(piece: SchematicCell) -> TypeGuard[Symbol]:
-    return piece == "*"
+_part_number = re.compile(r"\d+")
+_symbol = re.compile(r"[^\d.]")
+_gear = re.compile(r"\*")
 
 
-def is_part_location(piece: SchematicCell) -> TypeGuard[PartLocationId]:
-    return isinstance(piece, PartLocationId)
+def _bits(pattern: re.Pattern[str], line: str) -> int:
+    mask = 0
+    for match in pattern.finditer(line):
+        mask |= 1 << match.start()
+    return mask
 
 
+def _part_spans(y: int, line: str) -> list[PartSpan]:
+    return [
+        PartSpan(y, match.start(), match.end(), int(match.group()))
+        for match in _part_number.finditer(line)
+    ]
+
+
+@timed_phase("parse")
+def parse_bitmask_schematic(lines: Iterable[str]) -> BitmaskSchematic:
+    symbol_rows = []
+    gear_rows = []
+    part_rows = []
+    for y, line in enumerate(lines):
+        symbol_rows.append(_bits(_symbol, line))
+        gear_rows.append(_bits(_gear, line))
+        part_rows.append(_part_spans(y, line))
+    return BitmaskSchematic(
+        symbol_rows=symbol_rows, gear_rows=gear_rows, part_rows=part_rows
+    )
+
+
+@dataclasses.dataclass(frozen=True)
+class RowReport:
+    row: int
+    part_numbers: list[PartNumber]
+    gears: list[tuple[PartNumber, PartNumber]]
+
+
+@dataclasses.dataclass(frozen=True)
+class _WindowRow:
+    symbols: int
+    gears: int
+    parts: list[PartSpan]
+
+
+_BLANK_ROW = _WindowRow(symbols=0, gears=0, parts=[])
+
+
+def stream_schematic(lines: Iterable[str]) -> Iterator[RowReport]:
+    """
+    Reports the part numbers and gears of each row once the row below it has
+    been read. Only three rows are held at a time, each as a pair of bitmasks
+    and its part spans, so memory depends on the width of the schematic and
+    not on its height.
+    """
+    above, current = _BLANK_ROW, None
+    y = -1
+    for y, line in enumerate(lines):
+        below = _WindowRow(
+            _bits(_symbol, line), _bits(_gear, line), _part_spans(y, line)
+        )
+        if current is not None:
+            yield _report(y - 1, above, current, below)
+            above = current
+        current = below
+    if current is not None:
+        yield _report(y, above, current, _BLANK_ROW)
+
+
+def _report(
+    y: int, above: _WindowRow, current: _WindowRow, below: _WindowRow
+) -> RowReport:
+    reach = spread(above.symbols | current.symbols | below.symbols)
+    return RowReport(
+        row=y,
+        part_numbers=[part.value for part in current.parts if part.mask & reach],
+        gears=list(
+            gears_in_row(current.gears, (above.parts, current.parts, below.parts))
+        ),
+    )
+
+
+@timed_phase("parse")
 def parse_schematic(lines: Iterable[str]) -> Schematic:
     grid = []
     part_lookup = {}
+    symbol_index: dict[Symbol, list[Position]] = {}
+    span_index: dict[int, PartSpanRow] = {}
     current_part_location = 0
-    for line in lines:
+    for y, line in enumerate(lines):
         grid_row: list[SchematicCell] = []
         current_part_number = ""
-        for char in line:
+        spans = PartSpanRow()
+        for x, char in enumerate(line):
             if char.isdigit():
                 grid_row.append(current_part_location)
                 current_part_number = current_part_number + char
             else:
                 grid_row.append(char)
+                if char != ".":
+                    symbol_index.setdefault(char, []).append((x, y))
                 if current_part_number != "":
-                    part_lookup[current_part_location] = int(current_part_number)
+                    part_number = int(current_part_number)
+                    part_lookup[current_part_location] = part_number
+                    spans.add(PartSpan(y, x - len(current_part_number), x, part_number))
                     current_part_number = ""
                     current_part_location += 1
         if current_part_number != "":
-            part_lookup[current_part_location] = int(current_part_number)
+            part_number = int(current_part_number)
+            part_lookup[current_part_location] = part_number
+            x = len(line)
+            spans.add(PartSpan(y, x - len(current_part_number), x, part_number))
             current_part_location += 1
+        if spans.spans:
+            span_index[y] = spans
         grid.append(grid_row)
-    return Schematic(grid=grid, part_lookup=part_lookup)
+    return Schematic(
+        grid=grid,
+        part_lookup=part_lookup,
+        symbol_index=symbol_index,
+        span_index=span_index,
+    )
+
+
+def _index_grid(
+    grid: Grid, part_lookup: Mapping[PartLocationId, PartNumber]
+) -> tuple[dict[Symbol, list[Position]], dict[int, PartSpanRow]]:
+    symbol_index: dict[Symbol, list[Position]] = {}
+    span_index: dict[int, PartSpanRow] = {}
+    for y, row in enumerate(grid):
+        spans = PartSpanRow()
+        x_start = 0
+        for x, piece in enumerate(row):
+            if isinstance(piece, PartLocationId):
+                # A part's span ends where the next cell stops holding it
+                if x == 0 or row[x - 1] != piece:
+                    x_start = x
+                if (x + 1 == len(row) or row[x + 1] != piece) and (
+                    piece in part_lookup
+                ):
+                    spans.add(PartSpan(y, x_start, x + 1, part_lookup[piece]))
+            elif piece != ".":
+                symbol_index.setdefault(piece, []).append((x, y))
+        if spans.spans:
+            span_index[y] = spans
+    return symbol_index, span_index
 
 
 def get_neighbours(grid: Grid, position: Position) -> Iterator[SchematicCell]:
@@ -105,12 +334,26 @@ def get_part_number_neighbours(grid: Grid, position: Position) -> set[PartLocati
 
 
 def solve_part_one() -> int:
-    lines = read_lines("./src/day03/input.txt")
-    schema = parse_schematic(lines)
+    return solve_part_one_for_file("./src/day03/input.txt")
+
+
+def solve_part_one_for_file(file_path: str, *, streaming: bool = False) -> int:
+    lines = read_lines(file_path)
+    if streaming:
+        return sum(sum(report.part_numbers) for report in stream_schematic(lines))
+    schema = parse_bitmask_schematic(lines)
     return sum(schema.get_part_numbers_next_to_symbol())
 
 
 def solve_part_two() -> int:
-    lines = read_lines("./src/day03/input.txt")
-    schema = parse_schematic(lines)
+    return solve_part_two_for_file("./src/day03/input.txt")
+
+
+def solve_part_two_for_file(file_path: str, *, streaming: bool = False) -> int:
+    lines = read_lines(file_path)
+    if streaming:
+        return sum(
+            x * y for report in stream_schematic(lines) for (x, y) in report.gears
+        )
+    schema = parse_bitmask_schematic(lines)
     return sum(x * y for (x, y) in schema.get_gears())
@@ -1,9 +1,19 @@
+from itertools import cycle, islice
+
 from day03.part_one_and_two import (
+    BitmaskSchematic,
+    dilate,
     Grid,
     get_neighbours,
+    parse_bitmask_schematic,
     parse_schematic,
+    PartSpan,
+    PartSpanRow,
+    RowReport,
     Schematic,
     solve_part_one,
+    solve_part_one_for_file,
+    stream_schematic,
 )
 
 
@@ -78,5 +88,96 @@ def test_a_schema_can_return_the_part_ids_next_to_a_symbol_when_there_are_dupes(
     assert schematic.get_part_numbers_next_to_symbol() == [123, 123]
 
 
+def test_symbols_and_part_spans_get_parsed_into_bitmasks():
+    assert parse_bitmask_schematic(["12.#", "*.34"]) == BitmaskSchematic(
+        symbol_rows=[0b1000, 0b0001],
+        gear_rows=[0b0000, 0b0001],
+        part_rows=[[PartSpan(0, 0, 2, 12)], [PartSpan(1, 2, 4, 34)]],
+    )
+
+
+def test_dilation_covers_the_whole_neighbourhood_of_a_symbol():
+    assert dilate([0b000, 0b010, 0b000, 0b000]) == [0b111, 0b111, 0b111, 0b000]
+
+
+def test_the_bitmask_schematic_agrees_with_the_grid_one():
+    lines = ["467..114..", "...*......", "..35..633.", "......#...", "617*......"]
+    lines += [".....+.58.", "..592.....", "......755.", "...$.*....", ".664.598.."]
+
+    assert sorted(
+        parse_bitmask_schematic(lines).get_part_numbers_next_to_symbol()
+    ) == sorted(parse_schematic(lines).get_part_numbers_next_to_symbol())
+
+
+def test_parsing_indexes_symbols_by_type_and_part_spans_by_row():
+    schematic = parse_schematic(["12.#", "*.34"])
+
+    assert schematic.symbol_positions == {"#": [(3, 0)], "*": [(0, 1)]}
+    assert schematic.part_rows[0].spans == [PartSpan(0, 0, 2, 12)]
+    assert schematic.part_rows[1].spans == [PartSpan(1, 2, 4, 34)]
+
+
+def test_a_schematic_built_by_hand_answers_the_same_as_a_parsed_one():
+    built = Schematic(
+        grid=[[0, 0, 0, "*", ".", "."], [".", ".", ".", ".", 1, 1]],
+        part_lookup={0: 123, 1: 45},
+    )
+    parsed = parse_schematic(["123*..", "....45"])
+
+    assert built == parsed
+    assert built.get_part_numbers_next_to_symbol() == [123, 45]
+    assert parsed.get_part_numbers_next_to_symbol() == [123, 45]
+    assert list(built.get_gears()) == [(123, 45)]
+
+
+def test_a_span_row_finds_the_spans_overlapping_an_interval():
+    row = PartSpanRow()
+    for span in [PartSpan(0, 0, 2, 12), PartSpan(0, 4, 7, 345), PartSpan(0, 9, 10, 6)]:
+        row.add(span)
+
+    assert [span.value for span in row.overlapping(1, 5)] == [12, 345]
+    assert [span.value for span in row.overlapping(2, 4)] == []
+    assert [span.value for span in row.overlapping(6, 12)] == [345, 6]
+
+
+def test_parts_adjacent_to_any_set_of_symbols_can_be_found():
+    schematic = parse_schematic(
+        ["467..114..", "...*......", "..35..633.", "......#..."]
+    )
+
+    assert schematic.parts_adjacent_to("#") == {(6, 3): [PartSpan(2, 6, 9, 633)]}
+    assert schematic.parts_adjacent_to(["*", "#"]) == {
+        (3, 1): [PartSpan(0, 0, 3, 467), PartSpan(2, 2, 4, 35)],
+        (6, 3): [PartSpan(2, 6, 9, 633)],
+    }
+    assert schematic.parts_adjacent_to("$") == {}
+
+
+def test_streaming_reports_each_row_once_the_row_below_is_read():
+    reports = list(stream_schematic(["12.#", "..*.", "34.."]))
+
+    assert reports == [
+        RowReport(row=0, part_numbers=[12], gears=[]),
+        RowReport(row=1, part_numbers=[], gears=[(12, 34)]),
+        RowReport(row=2, part_numbers=[34], gears=[]),
+    ]
+
+
+def test_streaming_an_empty_schematic_reports_nothing():
+    assert list(stream_schematic([])) == []
+
+
+def test_streaming_never_needs_the_whole_schematic():
+    endless = cycle(["467..114..", "...*......", "..35..633."])
+
+    reports = list(islice(stream_schematic(endless), 4))
+
+    assert [report.part_numbers for report in reports] == [[467], [], [35], [467]]
+
+
 def test_it_can_solve_part_one():
     assert solve_part_one() == 553825
+
+
+def test_it_can_solve_part_one_while_streaming():
+    assert solve_part_one_for_file("./src/day03/input.txt", streaming=True) == 553825
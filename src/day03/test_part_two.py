@@ -1,8 +1,10 @@
 from day03.part_one_and_two import (
     Grid,
     get_part_number_neighbours,
+    parse_bitmask_schematic,
     parse_schematic,
     solve_part_two,
+    solve_part_two_for_file,
 )
 
 
@@ -28,5 +30,22 @@ def test_it_finds_all_the_gear_ratios():
     assert list(schematic.get_gears()) == [(41, 22)]
 
 
+def test_only_stars_next_to_exactly_two_parts_are_gears():
+    schematic = parse_bitmask_schematic(
+        [
+            "41.*7",
+            ".*...",
+            ".22#.",
+            "*9.*.",
+        ]
+    )
+
+    assert list(schematic.get_gears()) == [(41, 22), (22, 9)]
+
+
 def test_it_can_solve_part_two():
     assert solve_part_two() == 93994191
+
+
+def test_it_can_solve_part_two_while_streaming():
+    assert solve_part_two_for_file("./src/day03/input.txt", streaming=True) == 93994191
@@ -0,0 +1,29 @@
+from random import Random
+from typing import Iterator
+
+# Lines in the real input.txt
+LINES = 190
+
+NUMBERS = 10
+WINNING_NUMBERS = 25
+
+# Weighted so each card wins on average just under one copy. Anything more
+# and the number of copies in part two grows exponentially with the length.
+_matches = [0] * 60 + [1] * 20 + [2] * 10 + [3] * 5 + [5] * 3 + [10] * 2
+
+
+def generate(scale: int, seed: int = 0) -> Iterator[str]:
+    random = Random(seed)
+    for card_id in range(1, LINES * scale + 1):
+        pool = random.sample(range(1, 100), NUMBERS + WINNING_NUMBERS)
+        winning = pool[:WINNING_NUMBERS]
+        matches = random.choice(_matches)
+        numbers = random.sample(winning, matches) + pool[WINNING_NUMBERS:][matches:]
+        random.shuffle(numbers)
+        yield (
+            f"Card {card_id:>3}: {_number_string(numbers)} | {_number_string(winning)}"
+        )
+
+
+def _number_string(numbers: list[int]) -> str:
+    return " ".join(f"{n:>2}" for n in numbers)
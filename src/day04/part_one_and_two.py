@@ -1,7 +1,9 @@
 import dataclasses
-from typing import Sequence, Mapping
+import itertools
+from array import array
+from typing import Iterable, Sequence, Mapping
 
-from common import read_lines
+from common import read_lines, sum_over_parsed_lines, timed_phase
 
 CardId = int
 
@@ -28,8 +30,9 @@ class Row:
         self.winning_numbers = winning_numbers
 
         # Pre-calc some stuff
-        _winning_set = set(winning_numbers)
-        self.number_of_matches = sum(1 for n in self.numbers if n in _winning_set)
+        self.number_of_matches = (
+            number_mask(numbers) & number_mask(winning_numbers)
+        ).bit_count()
         self.score = (
             2 ** (self.number_of_matches - 1) if self.number_of_matches > 0 else 0
         )
@@ -66,6 +69,68 @@ class CardScratcher:
         return range(start, end)
 
 
+class DifferenceScratcher:
+    """
+    Scratches cards from their match counts alone. A card's copies are added
+    to the cards it wins by two entries in a difference array: one at the
+    first card won and a matching subtraction after the last. A running sum
+    turns those back into copy counts. Each card is O(1), however many cards
+    it wins.
+    """
+
+    matches: array
+
+    def __init__(self, matches: Iterable[int]):
+        self.matches = array("q", matches)
+
+    def scratch(self) -> int:
+        card_count = len(self.matches)
+        won = array("q", bytes(8 * (card_count + 1)))
+        copies_won = 0
+        cards_scratched = 0
+        for card, amount in enumerate(self.matches):
+            copies_won += won[card]
+            copies = copies_won + 1
+            cards_scratched += copies
+            if amount:
+                won[card + 1] += copies
+                won[min(card + 1 + amount, card_count)] -= copies
+        return cards_scratched
+
+
+def scratch_lines(lines: Iterable[str]) -> int:
+    """
+    Scratches cards as the lines arrive, holding only a ring buffer of the
+    copies won by cards still to come. A card can win at most as many cards
+    as it has numbers, so the ring is sized from the first card and memory
+    stays the same however long the file is.
+    """
+    lines = iter(lines)
+    first = next(lines, None)
+    if first is None:
+        return 0
+    size = len(_number_fields(first)[0]) + 1
+    won = array("q", bytes(8 * size))
+    copies_won = 0
+    cards_scratched = 0
+    for card, line in enumerate(itertools.chain([first], lines)):
+        slot = card % size
+        copies_won += won[slot]
+        won[slot] = 0
+        copies = copies_won + 1
+        cards_scratched += copies
+        amount = line_matches(line)
+        if amount >= size:
+            raise ValueError(
+                f"Card {card + 1} wins {amount} cards, more than the {size - 1} "
+                "the first card allowed for"
+            )
+        if amount:
+            won[(card + 1) % size] += copies
+            won[(card + 1 + amount) % size] -= copies
+    return cards_scratched
+
+
 def parse_row(row: str) -> Row:
     id_part, number_part = row.split(": ")
     raw_card_id = id_part.split(" ")[-1]
@@ -77,16 +142,60 @@ def parse_row(row: str) -> Row:
     )
 
 
+def number_mask(numbers: Iterable[int]) -> int:
+    """A bitset with bit n set for each number n"""
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
+
+
+def line_matches(line: str) -> int:
+    numbers, winning_numbers = _number_fields(line)
+    return (
+        number_mask(map(int, numbers)) & number_mask(map(int, winning_numbers))
+    ).bit_count()
+
+
+def _number_fields(line: str) -> tuple[list[str], list[str]]:
+    numbers, winning_numbers = line[line.index(":") + 1 :].split("|")
+    return numbers.split(), winning_numbers.split()
+
+
+@timed_phase("parse")
+def count_matches(lines: Iterable[str]) -> array:
+    """
+    The number of matches on every card, in file order, straight from the
+    lines without building a Row for each card
+    """
+    return array("q", map(line_matches, lines))
+
+
+def score_for_matches(matches: int) -> int:
+    return 1 << (matches - 1) if matches else 0
+
+
+def row_score(line: str) -> int:
+    return score_for_matches(line_matches(line))
+
+
 def solve_part_one() -> int:
-    lines = read_lines("./src/day04/input.txt")
-    rows = (parse_row(line) for line in lines)
-    return sum(row.score for row in rows)
+    return solve_part_one_for_file("./src/day04/input.txt")
 
 
 def solve_part_two() -> int:
-    lines = read_lines("./src/day04/input.txt")
-    rows = [parse_row(line) for line in lines]
-    scratcher = CardScratcher(rows)
+    return solve_part_two_for_file("./src/day04/input.txt")
+
+
+def solve_part_one_for_file(file_path: str) -> int:
+    return sum_over_parsed_lines(file_path, line_matches, score_for_matches)
+
+
+def solve_part_two_for_file(file_path: str, *, streaming: bool = False) -> int:
+    lines = read_lines(file_path)
+    if streaming:
+        return scratch_lines(lines)
+    scratcher = DifferenceScratcher(count_matches(lines))
     return scratcher.scratch()
 
 
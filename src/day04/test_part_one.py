@@ -1,6 +1,25 @@
+from array import array
+
 import pytest
 
-from day04.part_one_and_two import Row, parse_row, solve_part_one
+from common import recording_phases
+from day04.part_one_and_two import (
+    count_matches,
+    number_mask,
+    parse_row,
+    Row,
+    row_score,
+    solve_part_one,
+)
+
+EXAMPLE = [
+    "Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53",
+    "Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19",
+    "Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1",
+    "Card 4: 41 92 73 84 69 | 59 84 76 51 58  5 54 83",
+    "Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36",
+    "Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11",
+]
 
 
 def test_it_can_parse_a_row():
@@ -24,5 +43,30 @@ def test_it_scores_correctly(row_string, expected_score):
     assert parse_row(row_string).score == expected_score
 
 
+def test_numbers_become_a_bitset():
+    assert number_mask([0, 3, 5]) == 0b101001
+    assert number_mask([]) == 0
+
+
+def test_matches_for_every_card_can_be_counted_at_once():
+    assert count_matches(EXAMPLE) == array("q", [4, 2, 2, 1, 0, 0])
+    assert list(count_matches(EXAMPLE)) == [
+        parse_row(line).number_of_matches for line in EXAMPLE
+    ]
+
+
+def test_scoring_a_line_matches_scoring_its_row():
+    assert [row_score(line) for line in EXAMPLE] == [
+        parse_row(line).score for line in EXAMPLE
+    ]
+
+
+def test_parsing_shows_up_as_its_own_phase_in_part_one():
+    with recording_phases() as phases_ns:
+        assert solve_part_one() == 15205
+
+    assert phases_ns["parse"] > 0
+
+
 def test_it_can_solve_part_one():
     assert solve_part_one() == 15205
@@ -1,4 +1,15 @@
-from day04.part_one_and_two import parse_row, solve_part_two, CardScratcher
+import pytest
+
+from common import read_lines
+from day04.part_one_and_two import (
+    CardScratcher,
+    count_matches,
+    DifferenceScratcher,
+    parse_row,
+    scratch_lines,
+    solve_part_two,
+    solve_part_two_for_file,
+)
 
 
 def test_on_the_given_example():
@@ -31,5 +42,58 @@ def test_a_tweaked_example():
     assert scratcher.scratch() == 44
 
 
+@pytest.mark.parametrize(
+    "matches, expected_cards",
+    [
+        ([4, 2, 2, 1, 0, 0], 30),
+        ([4, 2, 2, 1, 1, 0], 44),
+        ([], 0),
+        ([3], 1),
+        ([0, 5, 0], 4),
+    ],
+)
+def test_the_difference_array_scratcher(matches, expected_cards):
+    assert DifferenceScratcher(matches).scratch() == expected_cards
+
+
+def test_both_scratchers_agree_on_the_real_input():
+    lines = list(read_lines("./src/day04/input.txt"))
+
+    assert (
+        DifferenceScratcher(count_matches(lines)).scratch()
+        == CardScratcher([parse_row(line) for line in lines]).scratch()
+    )
+
+
+def test_streaming_scratches_the_given_example():
+    lines = [
+        "Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53",
+        "Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19",
+        "Card 3:  1 21 53 59 44 | 69 82 63 72 16 21 14  1",
+        "Card 4: 41 92 73 84 69 | 59 84 76 51 58  5 54 83",
+        "Card 5: 87 83 26 28 32 | 88 30 70 12 93 22 82 36",
+        "Card 6: 31 18 13 56 72 | 74 77 10 23 35 67 36 11",
+    ]
+
+    assert scratch_lines(iter(lines)) == 30
+    assert scratch_lines([]) == 0
+
+
+def test_streaming_handles_cards_that_win_as_many_cards_as_they_have_numbers():
+    lines = ["Card 1: 1 2 | 1 2", "Card 2: 3 4 | 3 4", "Card 3: 5 6 | 7 8"]
+    lines += ["Card 4: 5 6 | 7 8"]
+
+    assert scratch_lines(lines) == DifferenceScratcher([2, 2, 0, 0]).scratch()
+
+
+def test_streaming_rejects_cards_wider_than_the_first():
+    with pytest.raises(ValueError):
+        scratch_lines(["Card 1: 1 | 2", "Card 2: 1 2 3 | 1 2 3"])
+
+
+def test_it_can_solve_part_two_while_streaming():
+    assert solve_part_two_for_file("./src/day04/input.txt", streaming=True) == 6189740
+
+
 def test_it_can_solve_part_two():
     assert solve_part_two() == 6189740
@@ -0,0 +1,50 @@
+from random import Random
+from typing import Iterator
+
+CATEGORIES = (
+    "seed",
+    "soil",
+    "fertilizer",
+    "water",
+    "light",
+    "temperature",
+    "humidity",
+    "location",
+)
+
+# The real input.txt has 10 seed ranges and roughly this many entries per map
+SEED_PAIRS = 10
+MAPPINGS_PER_MAP = 25
+
+MAX_VALUE = 2**32
+
+
+def generate(scale: int, seed: int = 0) -> Iterator[str]:
+    random = Random(seed)
+    seeds = []
+    for _ in range(SEED_PAIRS * scale):
+        start = random.randrange(MAX_VALUE)
+        seeds += [start, random.randint(1, (MAX_VALUE - start) // 8 + 1)]
+    yield f"seeds: {' '.join(str(s) for s in seeds)}"
+    for source, destination in zip(CATEGORIES, CATEGORIES[1:]):
+        yield ""
+        yield f"{source}-to-{destination} map:"
+        yield from _mappings(random, MAPPINGS_PER_MAP * scale)
+
+
+def _mappings(random: Random, count: int) -> Iterator[str]:
+    # Cut the number line into pieces then lay the same pieces out again in a
+    # shuffled order. Like the real puzzle every source range then lands on
+    # its own destination range.
+    cuts = sorted(random.sample(range(1, MAX_VALUE), count - 1))
+    source_starts = [0, *cuts]
+    lengths = [stop - start for start, stop in zip(source_starts, [*cuts, MAX_VALUE])]
+    order = list(range(count))
+    random.shuffle(order)
+    destination_start = 0
+    destination_starts = [0] * count
+    for piece in order:
+        destination_starts[piece] = destination_start
+        destination_start += lengths[piece]
+    for piece in random.sample(range(count), count):
+        yield f"{destination_starts[piece]} {source_starts[piece]} {lengths[piece]}"
@@ -2,13 +2,31 @@ from __future__ import annotations
 import dataclasses
 import itertools
 import re
-from typing import Sequence, Protocol, Mapping, Iterable
-
-from common import blocks_by_blank_line, read_lines, IntRange
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque, OrderedDict
+from functools import reduce
+from typing import Iterator, Sequence, Protocol, Mapping, Iterable
+
+from common import (
+    blocks_by_blank_line,
+    cached_per_file,
+    read_lines,
+    IntRange,
+    IntervalSet,
+    timed_phase,
+)
 
 MAX_INT_TO_TRY = 100_000_000_000_000
 
+DEFAULT_MAX_CACHED_ROUTES = 64
+
+# The whole number line as far as a composed mapper needs to cover it
+LOWEST_VALUE = -(2**63)
+HIGHEST_VALUE = 2**63 - 1
+
 mapper_definition = re.compile(r"([a-z]+)-to-([a-z]+) map:")
+number = re.compile(r"\d+")
 
 
 @dataclasses.dataclass
@@ -43,6 +61,12 @@ class MappingFunction(Protocol):
     def apply_for_range(self, ranges: Iterable[IntRange]) -> Iterable[IntRange]:
         pass
 
+    def map_batch(self, values: Iterable[int]) -> array:
+        pass
+
+    def sweep(self, ranges: Iterable[IntRange]) -> IntervalSet:
+        pass
+
     def reverse(self) -> MappingFunction:
         pass
 
@@ -64,6 +88,12 @@ class ChainedMapper(MappingFunction):
         second = self._second
         return second(first(value))
 
+    def map_batch(self, values: Iterable[int]) -> array:
+        return self._second.map_batch(self._first.map_batch(values))
+
+    def sweep(self, ranges: Iterable[IntRange]) -> IntervalSet:
+        return self._second.sweep(self._first.sweep(ranges).ranges())
+
     def reverse(self) -> ChainedMapper:
         return ChainedMapper(self._second.reverse(), self._first.reverse())
 
@@ -72,21 +102,45 @@ class ChainedMapper(MappingFunction):
         second = self._second
         return second.apply_for_range(first.apply_for_range(ranges))
 
+    def flatten(self) -> Mapper:
+        """Fold the whole chain into one Mapper, so a lookup crosses one table"""
+        return _flatten(self._first).then(_flatten(self._second))
+
+
+def _flatten(mapper: MappingFunction) -> Mapper:
+    if isinstance(mapper, Mapper):
+        return mapper
+    if isinstance(mapper, ChainedMapper):
+        return mapper.flatten()
+    raise TypeError(f"Can't flatten a {type(mapper).__name__}")
+
 
 class Mapper(MappingFunction):
     source: str
     destination: str
 
-    _mappings: Sequence[MappedRange]
+    # Breakpoints as parallel columns, sorted by source_start
+    _starts: array
+    _ends: array
+    _deltas: array
 
     def __init__(
         self, *, source: str, destination: str, mappings: Sequence[MappedRange]
     ):
         self.source = source
         self.destination = destination
-        self._mappings = sorted(mappings, key=lambda m: m.source_start)
+        ordered = sorted(mappings, key=lambda m: m.source_start)
+        self._starts = array("q", (m.source_start for m in ordered))
+        self._ends = array("q", (m.source_end for m in ordered))
+        self._deltas = array("q", (m.delta for m in ordered))
+
+    @property
+    def _mappings(self) -> Iterator[MappedRange]:
+        for start, end, delta in zip(self._starts, self._ends, self._deltas):
+            yield MappedRange(source_start=start, source_end=end, delta=delta)
 
     @classmethod
+    @timed_phase("parse")
     def from_text(cls, lines: Sequence[str]):
         [definition_line, *mapping_values] = lines
         definition = re.match(mapper_definition, definition_line)
@@ -99,10 +153,13 @@ class Mapper(MappingFunction):
         )
 
     def apply_for_range(self, ranges: Iterable[IntRange]) -> Iterable[IntRange]:
+        mappings = list(self._mappings)
         for input_range in ranges:
             lower = input_range.start
             upper = input_range.stop - 1
-            for mapping in self._mappings:
+            # Mappings ending before the range can't touch it
+            first = bisect_left(self._ends, lower)
+            for mapping in itertools.islice(mappings, first, None):
                 if upper < mapping.source_start:
                     yield IntRange(start=lower, stop=upper + 1)
                     lower = upper + 1
@@ -117,7 +174,7 @@ class Mapper(MappingFunction):
                     yield IntRange(start=lower, stop=mapping.source_start)
                     yield IntRange(
                         start=mapping.source_start + mapping.delta,
-                        stop=upper + mapping.delta,
+                        stop=upper + mapping.delta + 1,
                     )
                     lower = upper + 1
                     break
@@ -127,15 +184,106 @@ class Mapper(MappingFunction):
                         stop=mapping.source_end + mapping.delta + 1,
                     )
                     lower = mapping.source_end + 1
+                    continue
+                # The mapping sits wholly inside what's left of the range
+                yield IntRange(start=lower, stop=mapping.source_start)
+                yield IntRange(
+                    start=mapping.source_start + mapping.delta,
+                    stop=mapping.source_end + mapping.delta + 1,
+                )
+                lower = mapping.source_end + 1
             if lower <= upper:
                 yield IntRange(start=lower, stop=upper + 1)
 
+    def sweep(self, ranges: Iterable[IntRange]) -> IntervalSet:
+        """
+        Map a set of ranges in one merge of the sorted, coalesced ranges
+        against the sorted breakpoints. The output is coalesced too, so
+        fragments don't pile up from one stage to the next.
+        """
+        starts, ends, deltas = self._starts, self._ends, self._deltas
+        mapped = []
+        index = 0
+        for input_range in IntervalSet(ranges).ranges():
+            lower, stop = input_range.start, input_range.stop
+            while index < len(starts) and ends[index] < lower:
+                index += 1
+            while lower < stop:
+                if index == len(starts) or starts[index] >= stop:
+                    mapped.append(IntRange(start=lower, stop=stop))
+                    break
+                if lower < starts[index]:
+                    mapped.append(IntRange(start=lower, stop=starts[index]))
+                    lower = starts[index]
+                piece_stop = min(stop, ends[index] + 1)
+                delta = deltas[index]
+                mapped.append(IntRange(start=lower + delta, stop=piece_stop + delta))
+                lower = piece_stop
+                if lower > ends[index]:
+                    index += 1
+        return IntervalSet(mapped)
+
     def __call__(self, value: int) -> int:
-        for mapping in self._mappings:
-            if mapping.contains(value):
-                return value + mapping.delta
+        index = bisect_right(self._starts, value) - 1
+        if index >= 0 and value <= self._ends[index]:
+            return value + self._deltas[index]
         return value
 
+    def then(self, other: Mapper) -> Mapper:
+        """
+        A single Mapper equivalent to applying this one and then other. Each
+        piece of this mapper is shifted onto other's number line, cut where
+        other's pieces start and end, and shifted back with both deltas.
+        """
+        other_pieces = list(other._pieces())
+        other_starts = [start for start, _, _ in other_pieces]
+        mappings = []
+        for start, end, delta in self._pieces():
+            first = bisect_right(other_starts, start + delta) - 1
+            for other_start, other_end, other_delta in other_pieces[first:]:
+                if other_start > end + delta:
+                    break
+                if delta + other_delta != 0:
+                    mappings.append(
+                        MappedRange(
+                            source_start=max(start, other_start - delta),
+                            source_end=min(end, other_end - delta),
+                            delta=delta + other_delta,
+                        )
+                    )
+        return Mapper(
+            source=self.source,
+            destination=other.destination,
+            mappings=_merge_touching(mappings),
+        )
+
+    def _pieces(self) -> Iterator[tuple[int, int, int]]:
+        # Every value on the number line as (start, end, delta) pieces, with
+        # the gaps between mappings leaving values unchanged
+        lower = LOWEST_VALUE
+        for start, end, delta in zip(self._starts, self._ends, self._deltas):
+            if lower < start:
+                yield lower, start - 1, 0
+            yield start, end, delta
+            lower = end + 1
+        if lower <= HIGHEST_VALUE:
+            yield lower, HIGHEST_VALUE, 0
+
+    def map_batch(self, values: Iterable[int]) -> array:
+        """Map every value in one pass, without a method call per value"""
+        # Plain lists bisect faster than arrays, which box every probe
+        starts = self._starts.tolist()
+        ends, deltas = self._ends.tolist(), self._deltas.tolist()
+        mapped = array("q")
+        append = mapped.append
+        for value in values:
+            index = bisect_right(starts, value) - 1
+            if index >= 0 and value <= ends[index]:
+                append(value + deltas[index])
+            else:
+                append(value)
+        return mapped
+
     def reverse(self) -> Mapper:
         reversed_mappings = [
             MappedRange(
@@ -150,23 +298,95 @@ class Mapper(MappingFunction):
         )
 
 
+def _merge_touching(mappings: Iterable[MappedRange]) -> list[MappedRange]:
+    merged: list[MappedRange] = []
+    for mapping in sorted(mappings, key=lambda m: m.source_start):
+        if (
+            merged
+            and merged[-1].delta == mapping.delta
+            and merged[-1].source_end + 1 == mapping.source_start
+        ):
+            merged[-1] = dataclasses.replace(merged[-1], source_end=mapping.source_end)
+        else:
+            merged.append(mapping)
+    return merged
+
+
 class MappingCollection:
-    _mappers: Mapping[str, MappingFunction]
+    """
+    Mappers between categories, looked up by route. Routes are the shortest
+    path through the category graph, so an almanac can branch, and each
+    compiled route is kept - least recently used first out - so asking for
+    the same pair of categories again costs nothing.
+    """
 
-    def __init__(self, mappers: Iterable[MappingFunction]):
-        self._mappers = {mapper.source: mapper for mapper in mappers}
+    max_cached_routes: int
+    _mappers: Mapping[str, Sequence[MappingFunction]]
+    _routes: OrderedDict[tuple[str, str, bool], MappingFunction]
+
+    def __init__(
+        self,
+        mappers: Iterable[MappingFunction],
+        *,
+        max_cached_routes: int = DEFAULT_MAX_CACHED_ROUTES,
+    ):
+        if max_cached_routes < 1:
+            raise ValueError("The cache needs room for at least one route")
+        self.max_cached_routes = max_cached_routes
+        by_source: dict[str, list[MappingFunction]] = {}
+        for mapper in mappers:
+            by_source.setdefault(mapper.source, []).append(mapper)
+        self._mappers = by_source
+        self._routes = OrderedDict()
 
     def get_mapper_between(self, source: str, destination: str) -> MappingFunction:
-        mapper = self._mappers[source]
-        while mapper.destination != destination:
-            mapper = ChainedMapper(mapper, self._mappers[mapper.destination])
+        return self._cached(source, destination, flat=False)
+
+    def get_flat_mapper_between(self, source: str, destination: str) -> Mapper:
+        mapper = self._cached(source, destination, flat=True)
+        assert isinstance(mapper, Mapper)
+        return mapper
+
+    def route_between(self, source: str, destination: str) -> list[MappingFunction]:
+        """The fewest mappers that take source to destination, in order"""
+        came_by: dict[str, MappingFunction | None] = {source: None}
+        queue = deque([source])
+        while queue and destination not in came_by:
+            category = queue.popleft()
+            for mapper in self._mappers.get(category, ()):
+                if mapper.destination not in came_by:
+                    came_by[mapper.destination] = mapper
+                    queue.append(mapper.destination)
+        if destination not in came_by or source == destination:
+            raise ValueError(f"No mappers lead from {source} to {destination}")
+        route = []
+        category = destination
+        while (step := came_by[category]) is not None:
+            route.append(step)
+            category = step.source
+        return route[::-1]
+
+    def _cached(self, source: str, destination: str, *, flat: bool) -> MappingFunction:
+        key = (source, destination, flat)
+        if key in self._routes:
+            self._routes.move_to_end(key)
+            return self._routes[key]
+        if flat:
+            mapper: MappingFunction = _flatten(
+                self._cached(source, destination, flat=False)
+            )
+        else:
+            mapper = reduce(ChainedMapper, self.route_between(source, destination))
+        self._routes[key] = mapper
+        while len(self._routes) > self.max_cached_routes:
+            self._routes.popitem(last=False)
         return mapper
 
 
 def solve_part_one_for_file(file_path: str) -> int:
     mapper, seeds = _mapper_and_seeds(file_path)
 
-    return min(mapper(s) for s in seeds)
+    return min(mapper.map_batch(seeds))
 
 
 def solve_part_two_for_file(file_path: str) -> int:
@@ -177,20 +397,23 @@ def solve_part_two_for_file(file_path: str) -> int:
         for (start, delta) in itertools.batched(seeds, 2)
     ]
 
-    results = sorted(
-        list(mapper.apply_for_range(seed_range_min_maxes)), key=lambda r: r.start
-    )
+    return mapper.sweep(seed_range_min_maxes).min()
+
 
-    return results[0].start
+def _mapper_and_seeds(file_path: str) -> tuple[Mapper, Iterator[int]]:
+    mapper, seed_line = _almanac_for_file(file_path)
+    return mapper, (int(seed.group()) for seed in number.finditer(seed_line))
 
 
-def _mapper_and_seeds(file_path):
+@cached_per_file
+@timed_phase("parse")
+def _almanac_for_file(file_path: str) -> tuple[Mapper, str]:
+    # Both parts share one composed seed to location mapper
     blocks = blocks_by_blank_line(read_lines(file_path))
     [seed_line] = next(blocks)
-    seeds = (int(s) for s in seed_line.split(" ")[1:])
     mappers = MappingCollection(Mapper.from_text(m) for m in blocks)
-    mapper = mappers.get_mapper_between("seed", "location")
-    return mapper, seeds
+    mapper = mappers.get_flat_mapper_between("seed", "location")
+    return mapper, seed_line
 
 
 def solve_part_one():
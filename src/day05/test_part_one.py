@@ -1,4 +1,10 @@
+from array import array
+
+import pytest
+
+from common import blocks_by_blank_line, read_lines
 from day05.part_one_and_two import (
+    MappedRange,
     Mapper,
     ChainedMapper,
     MappingCollection,
@@ -60,6 +66,130 @@ def test_a_mapping_collection_can_give_the_correct_mappings():
     assert mapper.destination == "fertilizer"
 
 
+def test_lookups_land_on_the_right_mapping_at_every_boundary():
+    mappings = [
+        MappedRange(source_start=start, source_end=start + 4, delta=start)
+        for start in range(0, 100_000, 10)
+    ]
+    mapper = Mapper(source="a", destination="b", mappings=list(reversed(mappings)))
+
+    for value in [-1, 0, 4, 5, 9, 10, 14, 15, 99_990, 99_994, 99_995, 200_000]:
+        expected = next((value + m.delta for m in mappings if m.contains(value)), value)
+        assert mapper(value) == expected
+
+
+def test_a_whole_batch_of_values_can_be_mapped_at_once():
+    mapper = Mapper.from_text(["seed-to-soil map:", "50 98 2", "52 50 48"])
+
+    assert mapper.map_batch([49, 50, 97, 98, 99, 100]) == array(
+        "q", [49, 52, 99, 50, 51, 100]
+    )
+    assert mapper.map_batch(iter([])) == array("q")
+
+
+def test_chained_mappers_map_batches_stage_by_stage():
+    mapper = ChainedMapper(
+        Mapper.from_text(["seed-to-soil map:", "50 98 2", "52 50 48"]),
+        Mapper.from_text(["soil-to-fertilizer map:", "0 15 37", "37 52 2", "39 0 15"]),
+    )
+    values = range(0, 120)
+
+    assert list(mapper.map_batch(values)) == [mapper(value) for value in values]
+
+
+def test_two_mappers_can_be_composed_into_one():
+    mapper_one = Mapper.from_text(["seed-to-soil map:", "50 98 2", "52 50 48"])
+    mapper_two = Mapper.from_text(
+        ["soil-to-fertilizer map:", "0 15 37", "37 52 2", "39 0 15"]
+    )
+    composed = mapper_one.then(mapper_two)
+
+    assert composed.source == "seed"
+    assert composed.destination == "fertilizer"
+    for value in range(-5, 120):
+        assert composed(value) == mapper_two(mapper_one(value))
+
+
+def test_a_whole_chain_flattens_into_one_mapper():
+    blocks = blocks_by_blank_line(read_lines("./src/day05/example.txt"))
+    next(blocks)
+    mappers = MappingCollection(Mapper.from_text(m) for m in blocks)
+    chained = mappers.get_mapper_between("seed", "location")
+    assert isinstance(chained, ChainedMapper)
+
+    flattened = chained.flatten()
+
+    assert flattened.source == "seed"
+    assert flattened.destination == "location"
+    for value in range(0, 200):
+        assert flattened(value) == chained(value)
+
+
+def _branching_almanac(**kwargs) -> MappingCollection:
+    return MappingCollection(
+        [
+            Mapper.from_text(["seed-to-soil map:", "50 98 2"]),
+            Mapper.from_text(["soil-to-water map:", "0 50 1"]),
+            Mapper.from_text(["seed-to-light map:", "7 98 1"]),
+            Mapper.from_text(["light-to-water map:", "1 7 1"]),
+            Mapper.from_text(["water-to-location map:", "100 0 2"]),
+            Mapper.from_text(["seed-to-humidity map:", "5 98 1"]),
+        ],
+        **kwargs,
+    )
+
+
+def test_routes_through_a_branching_almanac_take_the_fewest_mappers():
+    mappers = _branching_almanac()
+
+    route = mappers.route_between("seed", "location")
+
+    assert [(m.source, m.destination) for m in route] == [
+        ("seed", "soil"),
+        ("soil", "water"),
+        ("water", "location"),
+    ]
+    assert mappers.get_mapper_between("seed", "location")(98) == 100
+    assert mappers.get_mapper_between("light", "location")(7) == 101
+
+
+def test_categories_without_a_route_between_them_are_rejected():
+    mappers = _branching_almanac()
+
+    with pytest.raises(ValueError):
+        mappers.get_mapper_between("location", "seed")
+    with pytest.raises(ValueError):
+        mappers.get_mapper_between("humidity", "location")
+
+
+def test_repeated_route_queries_come_from_the_cache():
+    mappers = _branching_almanac()
+
+    chained = mappers.get_mapper_between("seed", "location")
+    flat = mappers.get_flat_mapper_between("seed", "location")
+
+    assert mappers.get_mapper_between("seed", "location") is chained
+    assert mappers.get_flat_mapper_between("seed", "location") is flat
+    assert flat(98) == chained(98) == 100
+
+
+def test_the_least_recently_used_routes_are_evicted():
+    mappers = _branching_almanac(max_cached_routes=2)
+
+    seed_to_water = mappers.get_mapper_between("seed", "water")
+    seed_to_location = mappers.get_mapper_between("seed", "location")
+    assert mappers.get_mapper_between("seed", "water") is seed_to_water
+    mappers.get_mapper_between("light", "location")
+
+    assert mappers.get_mapper_between("seed", "water") is seed_to_water
+    assert mappers.get_mapper_between("seed", "location") is not seed_to_location
+
+
+def test_the_route_cache_needs_room_for_a_route():
+    with pytest.raises(ValueError):
+        _branching_almanac(max_cached_routes=0)
+
+
 def test_it_works_for_the_example_file():
     assert solve_part_one_for_file("./src/day05/example.txt") == 35
 
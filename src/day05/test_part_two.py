@@ -1,7 +1,10 @@
+from random import Random
+
 import pytest
 
-from common import IntRange
+from common import IntRange, IntervalSet
 from day05.part_one_and_two import (
+    MappedRange,
     solve_part_two_for_file,
     solve_part_two,
     Mapper,
@@ -65,6 +68,66 @@ def test_a_whole_range_can_be_matched_and_gets_split_if_needed_d():
     ]
 
 
+def test_a_range_ending_inside_a_mapping_after_a_gap_keeps_its_last_value():
+    mapper = Mapper.from_text(["seed-to-soil map:", "50 98 2"])
+
+    assert list(mapper.apply_for_range([IntRange(start=96, stop=99)])) == [
+        IntRange(start=96, stop=98),
+        IntRange(start=50, stop=51),
+    ]
+
+
+def test_a_mapping_wholly_inside_a_range_still_gets_applied():
+    mapper = Mapper.from_text(["seed-to-soil map:", "100 0 10", "200 20 10"])
+
+    assert list(mapper.apply_for_range([IntRange(start=5, stop=40)])) == [
+        IntRange(start=105, stop=110),
+        IntRange(start=10, stop=20),
+        IntRange(start=200, stop=210),
+        IntRange(start=30, stop=40),
+    ]
+
+
+def test_sweeping_coalesces_the_mapped_ranges():
+    mapper = Mapper.from_text(["seed-to-soil map:", "50 98 2", "52 50 48"])
+
+    assert mapper.sweep(
+        [IntRange(start=98, stop=101), IntRange(start=48, stop=50)]
+    ) == IntervalSet([IntRange(start=48, stop=52), IntRange(start=100, stop=101)])
+
+
+def _random_mapper(random: Random, source: str, destination: str) -> Mapper:
+    cuts = sorted(random.sample(range(200), 12))
+    mappings = [
+        MappedRange(source_start=start, source_end=end, delta=random.randint(-50, 50))
+        for start, end in zip(cuts[::2], cuts[1::2])
+        if random.random() < 0.8
+    ]
+    return Mapper(source=source, destination=destination, mappings=mappings)
+
+
+def _random_ranges(random: Random) -> list[IntRange]:
+    ranges = []
+    for _ in range(random.randint(1, 4)):
+        start = random.randint(-10, 210)
+        ranges.append(IntRange(start=start, stop=start + random.randint(0, 60)))
+    return ranges
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_range_mapping_agrees_with_mapping_every_point(seed):
+    random = Random(seed)
+    mapper = ChainedMapper(
+        _random_mapper(random, "seed", "soil"),
+        _random_mapper(random, "soil", "fertilizer"),
+    )
+    ranges = _random_ranges(random)
+    expected = {mapper(value) for input_range in ranges for value in input_range}
+
+    assert set(IntervalSet(mapper.apply_for_range(ranges))) == expected
+    assert set(mapper.sweep(ranges)) == expected
+
+
 def test_chained_mappers_can_be_called_with_a_range():
     mapper = ChainedMapper(
         Mapper.from_text(["seed-to-soil map:", "50 98 2", "52 50 48"]),
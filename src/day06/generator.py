@@ -0,0 +1,14 @@
+from random import Random
+from typing import Iterator
+
+# Races in the real input
+RACES = 4
+
+
+def generate(scale: int, seed: int = 0) -> Iterator[str]:
+    random = Random(seed)
+    times = [random.randint(10, 100) for _ in range(RACES * scale)]
+    # The best possible distance is (time / 2) ** 2 so the record has to be below it
+    records = [random.randint(1, time * time // 4 - 1) for time in times]
+    yield "Time:     " + " ".join(f"{t:>5}" for t in times)
+    yield "Distance: " + " ".join(f"{r:>5}" for r in records)
@@ -3,7 +3,7 @@ import dataclasses
 import math
 from typing import Collection, Iterable
 
-from common import multiply_together, IntRange
+from common import multiply_together, IntRange, read_lines
 
 
 @dataclasses.dataclass
@@ -64,6 +64,32 @@ def solve_part_two() -> int:
     return _ways_of_winning_races(input_data_part_two)
 
 
+def solve_part_one_for_file(file_path: str) -> int:
+    return _ways_of_winning_races(parse_races(read_lines(file_path)))
+
+
+def solve_part_two_for_file(file_path: str) -> int:
+    return _ways_of_winning_races([parse_kerned_race(read_lines(file_path))])
+
+
+def parse_races(lines: Iterable[str]) -> list[RaceData]:
+    # Time:        41     66     72     66
+    # Distance:   244   1047   1228   1040
+    time_line, distance_line = lines
+    return [
+        RaceData(time_allowed=int(time), distance_record=int(distance))
+        for time, distance in zip(time_line.split()[1:], distance_line.split()[1:])
+    ]
+
+
+def parse_kerned_race(lines: Iterable[str]) -> RaceData:
+    time_line, distance_line = lines
+    return RaceData(
+        time_allowed=int("".join(time_line.split()[1:])),
+        distance_record=int("".join(distance_line.split()[1:])),
+    )
+
+
 def _ways_of_winning_races(races: Iterable[RaceData]):
     winning_options = (len(winning_acceleration_times(race)) for race in races)
     return multiply_together(winning_options)
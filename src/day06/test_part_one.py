@@ -1,4 +1,9 @@
-from day06.part_one_and_two import RaceData, winning_acceleration_times, solve_part_one
+from day06.part_one_and_two import (
+    RaceData,
+    parse_races,
+    winning_acceleration_times,
+    solve_part_one,
+)
 
 
 def test_it_calculates_the_winning_values():
@@ -40,3 +45,10 @@ def test_an_impossible_race_is_just_an_empty_result():
 
 def test_it_can_solve_part_one():
     assert solve_part_one() == 74698
+
+
+def test_races_can_be_parsed_from_the_puzzle_input():
+    assert parse_races(["Time:        41     66", "Distance:   244   1047"]) == [
+        RaceData(time_allowed=41, distance_record=244),
+        RaceData(time_allowed=66, distance_record=1047),
+    ]
@@ -1,5 +1,11 @@
-from day06.part_one_and_two import solve_part_two
+from day06.part_one_and_two import RaceData, parse_kerned_race, solve_part_two
 
 
 def test_it_can_solve_part_two():
     assert solve_part_two() == 27563421
+
+
+def test_the_kerned_race_ignores_the_spaces():
+    assert parse_kerned_race(
+        ["Time:        41     66", "Distance:   244   1047"]
+    ) == RaceData(time_allowed=4166, distance_record=2441047)
@@ -0,0 +1,12 @@
+from random import Random
+from typing import Iterator
+
+# Lines in the real input.txt
+LINES = 1000
+
+
+def generate(scale: int, seed: int = 0) -> Iterator[str]:
+    random = Random(seed)
+    for _ in range(LINES * scale):
+        hand = "".join(random.choices("23456789TJQKA", k=5))
+        yield f"{hand} {random.randint(1, 1000)}"
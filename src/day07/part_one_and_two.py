@@ -4,7 +4,7 @@ from collections import Counter
 from enum import Enum, auto
 from functools import total_ordering
 
-from common import read_lines
+from common import phase, read_lines
 
 
 class Card(int, Enum):
@@ -175,8 +175,17 @@ def solve_part_two() -> int:
     return solve_for_file("./src/day07/input.txt", jokers_exist=True)
 
 
+def solve_part_one_for_file(file_path: str) -> int:
+    return solve_for_file(file_path)
+
+
+def solve_part_two_for_file(file_path: str) -> int:
+    return solve_for_file(file_path, jokers_exist=True)
+
+
 def solve_for_file(file_path, *, jokers_exist: bool = False) -> int:
     lines = read_lines(file_path)
-    hands = [parse(line, jokers_exist=jokers_exist) for line in lines]
+    with phase("parse"):
+        hands = [parse(line, jokers_exist=jokers_exist) for line in lines]
     hands_and_rank = enumerate(sorted(hands, key=lambda h: h.hand))
     return sum((rank + 1) * hand.bid for rank, hand in hands_and_rank)
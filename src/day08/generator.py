@@ -0,0 +1,70 @@
+from random import Random
+from typing import Iterator
+
+# Roughly the number of nodes and directions in the real input.txt
+NODES = 700
+DIRECTIONS = 270
+GHOSTS = 6
+
+# Labels in the middle of a path must never end in A or Z
+_label_characters = "BCDEFGHIJKLMNOPQRSTUVWXY0123456789"
+
+
+def generate(scale: int, seed: int = 0) -> Iterator[str]:
+    """
+    Each ghost walks a path of nodes from its xxA start to its xxZ end. The
+    end node leads to the same place as the start, so the loop back round to
+    the end is exactly as long as the first walk. The path lengths are
+    distinct primes so their common multiple is the puzzle answer for part two.
+    """
+    random = Random(seed)
+    yield "".join(random.choices("LR", k=DIRECTIONS))
+    yield ""
+
+    path_lengths = _distinct_primes_near(NODES * scale // GHOSTS, GHOSTS)
+    width = max(3, len(str(GHOSTS)) + 1, _label_width(NODES * scale))
+    labels = _labels(width)
+    nodes = []
+    for ghost, path_length in enumerate(path_lengths):
+        if ghost == 0:
+            # Part one always walks from AAA to ZZZ
+            start, end = "AAA", "ZZZ"
+        else:
+            start, end = f"{ghost:0{width - 1}d}A", f"{ghost:0{width - 1}d}Z"
+        path = [next(labels) for _ in range(path_length - 1)] + [end]
+        nodes.append(f"{start} = ({path[0]}, {path[0]})")
+        nodes.append(f"{end} = ({path[0]}, {path[0]})")
+        for here, after in zip(path, path[1:]):
+            nodes.append(f"{here} = ({after}, {after})")
+    random.shuffle(nodes)
+    yield from nodes
+
+
+def _labels(width: int) -> Iterator[str]:
+    base = len(_label_characters)
+    n = 0
+    while True:
+        label = ""
+        remaining = n
+        for _ in range(width):
+            remaining, digit = divmod(remaining, base)
+            label += _label_characters[digit]
+        yield label
+        n += 1
+
+
+def _label_width(count: int) -> int:
+    width = 1
+    while len(_label_characters) ** width < count:
+        width += 1
+    return width
+
+
+def _distinct_primes_near(target: int, count: int) -> list[int]:
+    primes: list[int] = []
+    candidate = max(target, 3)
+    while len(primes) < count:
+        if all(candidate % d for d in range(2, int(candidate**0.5) + 1)):
+            primes.append(candidate)
+        candidate += 1
+    return primes
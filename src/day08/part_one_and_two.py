@@ -5,7 +5,7 @@ from enum import Enum, auto
 from functools import cache
 from typing import Iterator, Iterable, Callable
 
-from common import read_lines
+from common import read_lines, timed_phase
 from common_maths import smallest_common_multiple
 
 
@@ -78,6 +78,7 @@ class NodeMap:
         raise Exception("Not sure how we got here")
 
 
+@timed_phase("parse")
 def parse(input_data: Iterable[str]) -> tuple[InfiniteDirections, NodeMap]:
     lines = iter(input_data)
     direction_part = next(lines)
@@ -140,13 +141,21 @@ def multiverse_steps_required(directions: InfiniteDirections, node_map: NodeMap)
 
 
 def solve_part_one() -> int:
-    lines = read_lines("./src/day08/input.txt")
+    return solve_part_one_for_file("./src/day08/input.txt")
+
+
+def solve_part_one_for_file(file_path: str) -> int:
+    lines = read_lines(file_path)
     directions, nodes = parse(lines)
     steps, _final_node = steps_required(directions, nodes)
     return steps
 
 
 def solve_part_two() -> int:
-    lines = read_lines("./src/day08/input.txt")
+    return solve_part_two_for_file("./src/day08/input.txt")
+
+
+def solve_part_two_for_file(file_path: str) -> int:
+    lines = read_lines(file_path)
     directions, nodes = parse(lines)
     return multiverse_steps_required(directions, nodes)
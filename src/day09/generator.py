@@ -0,0 +1,19 @@
+from random import Random
+from typing import Iterator
+
+# Lines in the real input.txt
+LINES = 200
+SEQUENCE_LENGTH = 21
+
+
+def generate(scale: int, seed: int = 0) -> Iterator[str]:
+    # Every line is a polynomial sampled at 0, 1, 2... so the differences
+    # always bottom out in zeros
+    random = Random(seed)
+    for _ in range(LINES * scale):
+        coefficients = [random.randint(-9, 9) for _ in range(random.randint(1, 8))]
+        values = (
+            sum(c * x**power for power, c in enumerate(coefficients))
+            for x in range(SEQUENCE_LENGTH)
+        )
+        yield " ".join(str(v) for v in values)
@@ -1,6 +1,6 @@
 from typing import Sequence, Iterable
 
-from common import read_lines
+from common import sum_over_parsed_lines
 
 
 def difference_sequence(numbers: Sequence[int]) -> list[int]:
@@ -25,15 +25,21 @@ def previous_number(numbers: Sequence[int]) -> int:
     return numbers[0] - previous_number(diffs)
 
 
+def parse_sequence(line: str) -> list[int]:
+    return list(map(int, line.split(" ")))
+
+
 def solve_part_one() -> int:
-    lines = read_lines("./src/day09/input.txt")
-    sequences = (list(map(int, line.split(" "))) for line in lines)
-    nexts = (next_number(sequence) for sequence in sequences)
-    return sum(nexts)
+    return solve_part_one_for_file("./src/day09/input.txt")
 
 
 def solve_part_two() -> int:
-    lines = read_lines("./src/day09/input.txt")
-    sequences = (list(map(int, line.split(" "))) for line in lines)
-    prevs = (previous_number(sequence) for sequence in sequences)
-    return sum(prevs)
+    return solve_part_two_for_file("./src/day09/input.txt")
+
+
+def solve_part_one_for_file(file_path: str) -> int:
+    return sum_over_parsed_lines(file_path, parse_sequence, next_number)
+
+
+def solve_part_two_for_file(file_path: str) -> int:
+    return sum_over_parsed_lines(file_path, parse_sequence, previous_number)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import dataclasses
+import functools
+import json
+import math
+import statistics
+import time
+from typing import Iterable, Sequence
+
+from answer_cache import AnswerCache
+from common import clear_file_caches, DayRegistry, Solver, phase, recording_phases
+
+
+@dataclasses.dataclass
+class Timing:
+    solver: Solver
+    answer: object
+    runs_ns: Sequence[int]
+    phases_ns: dict[str, int] | None = None
+
+    @property
+    def min_ns(self) -> int:
+        return min(self.runs_ns)
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.runs_ns)
+
+    @property
+    def p95_ns(self) -> int:
+        return percentile(self.runs_ns, 95)
+
+    def as_dict(self) -> dict:
+        phases = {} if self.phases_ns is None else {"phases_ns": self.phases_ns}
+        return {
+            "day": self.solver.day,
+            "part": self.solver.part,
+            "answer": self.answer,
+            "runs": len(self.runs_ns),
+            "min_ns": self.min_ns,
+            "median_ns": self.median_ns,
+            "p95_ns": self.p95_ns,
+            **phases,
+        }
+
+
+def discover_solvers(source_dir: str = "./src") -> list[Solver]:
+    return DayRegistry(source_dir).solvers
+
+
+def select_solvers(solvers: Iterable[Solver], days: Iterable[str]) -> list[Solver]:
+    wanted = {_normalise_day(day) for day in days}
+    if not wanted:
+        return list(solvers)
+    return [solver for solver in solvers if solver.day in wanted]
+
+
+def time_solver(
+    solver: Solver,
+    *,
+    warmup: int = 1,
+    repeat: int = 5,
+    phases: bool = False,
+) -> Timing:
+    if repeat < 1:
+        raise ValueError("At least one timed run is needed")
+    function = solver.load()
+    # Every run starts from scratch rather than reusing a parse kept from
+    # the run before, or from the other part of the same day
+    for _ in range(warmup):
+        clear_file_caches()
+        function()
+    runs_ns = []
+    answer = None
+    for _ in range(repeat):
+        clear_file_caches()
+        start = time.perf_counter_ns()
+        answer = function()
+        runs_ns.append(time.perf_counter_ns() - start)
+    timing = Timing(solver=solver, answer=answer, runs_ns=runs_ns)
+    if phases:
+        timing.phases_ns = record_phases(solver)
+    return timing
+
+
+def record_phases(solver: Solver) -> dict[str, int]:
+    """
+    Runs the solver once more with the phase timings switched on.
+    """
+    function = solver.load()
+    clear_file_caches()
+    with recording_phases() as phases_ns:
+        with phase("solve"):
+            function()
+    return phases_ns
+
+
+def time_solvers(
+    solvers: Sequence[Solver],
+    *,
+    warmup: int = 1,
+    repeat: int = 5,
+    workers: int | None = None,
+    cache: AnswerCache | None = None,
+    phases: bool = False,
+) -> list[Timing]:
+    """
+    Times every solver. When workers is set the solvers are spread over that
+    many processes (0 meaning one per core). The results always come back in
+    the same order as the solvers passed in.
+
+    The solvers are always really run as timing a cache hit would say nothing
+    about the solver. A cache only has the answers found recorded in it.
+    """
+    timer = functools.partial(time_solver, warmup=warmup, repeat=repeat, phases=phases)
+    if workers is None:
+        timings = [timer(solver) for solver in solvers]
+    else:
+        # Imported here so runs without workers don't load multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers or None) as pool:
+            timings = list(pool.map(timer, solvers))
+    if cache is not None:
+        for timing in timings:
+            cache.record(timing.solver, timing.answer)
+        cache.save()
+    return timings
+
+
+def percentile(values: Sequence[int], percent: float) -> int:
+    # Nearest rank - always returns one of the values actually measured
+    ordered = sorted(values)
+    rank = math.ceil(percent / 100 * len(ordered))
+    return ordered[max(rank, 1) - 1]
+
+
+def format_table(timings: Iterable[Timing]) -> str:
+    rows = [
+        f"{'solver':<14} {'min':>10} {'median':>10} {'p95':>10}  answer",
+    ]
+    for timing in timings:
+        rows.append(
+            f"{timing.solver.name:<14} "
+            f"{_format_ns(timing.min_ns):>10} "
+            f"{_format_ns(timing.median_ns):>10} "
+            f"{_format_ns(timing.p95_ns):>10}  "
+            f"{timing.answer}"
+        )
+    return "\n".join(rows)
+
+
+def format_phases(timings: Iterable[Timing]) -> str:
+    names = ("read", "parse", "solve")
+    rows = [f"{'solver':<14} " + " ".join(f"{name:>18}" for name in names)]
+    for timing in timings:
+        phases_ns = timing.phases_ns or {}
+        total = sum(phases_ns.values()) or 1
+        cells = (
+            f"{_format_ns(phases_ns.get(name, 0)):>10} ({phases_ns.get(name, 0) / total:>4.0%})"
+            for name in names
+        )
+        rows.append(f"{timing.solver.name:<14} " + " ".join(cells))
+    return "\n".join(rows)
+
+
+def format_json(timings: Iterable[Timing]) -> str:
+    return json.dumps([timing.as_dict() for timing in timings], indent=2)
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1_000_000_000:
+        return f"{ns / 1_000_000_000:.2f}s"
+    if ns >= 1_000_000:
+        return f"{ns / 1_000_000:.2f}ms"
+    return f"{ns / 1_000:.1f}µs"
+
+
+def _normalise_day(day: str) -> str:
+    number = day.removeprefix("day")
+    return f"day{int(number):02d}"
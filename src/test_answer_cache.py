@@ -0,0 +1,54 @@
+from answer_cache import AnswerCache
+from runner import Solver
+
+part_one = Solver(
+    day="day06", part="one", module="day06.part_one_and_two", function="solve_part_one"
+)
+part_two = Solver(
+    day="day06", part="two", module="day06.part_one_and_two", function="solve_part_two"
+)
+
+
+def test_a_miss_runs_the_solver_and_keeps_the_answer(tmp_path):
+    cache = AnswerCache(str(tmp_path / "cache.json"))
+
+    assert part_one not in cache
+    assert cache.get_or_solve(part_one) == 74698
+    assert part_one in cache
+
+
+def test_a_hit_does_not_run_the_solver_again(tmp_path):
+    cache = AnswerCache(str(tmp_path / "cache.json"))
+    cache.record(part_one, "remembered")
+
+    assert cache.get_or_solve(part_one) == "remembered"
+
+
+def test_answers_survive_between_caches(tmp_path):
+    path = str(tmp_path / "cache.json")
+    AnswerCache(path).get_or_solve(part_two)
+
+    assert part_two in AnswerCache(path)
+
+
+def test_the_two_parts_have_different_keys(tmp_path):
+    cache = AnswerCache(str(tmp_path / "cache.json"))
+
+    assert cache.key_for(part_one) != cache.key_for(part_two)
+
+
+def test_the_least_recently_used_answer_is_evicted(tmp_path):
+    cache = AnswerCache(str(tmp_path / "cache.json"), max_entries=1)
+    cache.get_or_solve(part_one)
+    cache.get_or_solve(part_two)
+
+    assert len(cache) == 1
+    assert part_one not in cache
+    assert part_two in cache
+
+
+def test_a_corrupt_cache_file_is_treated_as_empty(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+
+    assert len(AnswerCache(str(path))) == 0
@@ -1,4 +1,29 @@
-from common import read_lines, blocks_by_blank_line
+import itertools
+import os
+import subprocess
+import sys
+from random import Random
+
+from common import (
+    read_lines,
+    blocks_by_blank_line,
+    cached_per_file,
+    clear_file_caches,
+    read_byte_lines,
+    read_line_batches,
+    DayRegistry,
+    Solver,
+    import_times_by_day,
+    map_reduce_chunks,
+    sum_over_lines,
+    sum_over_parsed_lines,
+    phase,
+    recording_phases,
+    timed_iterable,
+    timed_phase,
+    IntRange,
+    IntervalSet,
+)
 
 
 def test_the_file_reader_gets_all_lines_when_no_blanks():
@@ -17,3 +42,254 @@ def test_lines_can_be_broken_into_chunks_by_new_lines():
         ["line one"],
         ["line three"],
     ]
+
+
+def test_the_byte_reader_gets_raw_stripped_lines():
+    assert list(read_byte_lines("./src/examples/three_lines_with_a_blank.txt")) == [
+        b"line one",
+        b"",
+        b"line three",
+    ]
+
+
+def test_the_byte_reader_copes_with_an_empty_file(tmp_path):
+    empty_file = tmp_path / "empty.txt"
+    empty_file.write_bytes(b"")
+
+    assert list(read_byte_lines(str(empty_file))) == []
+
+
+def test_lines_spanning_several_blocks_can_be_abandoned_part_way(tmp_path):
+    big_file = tmp_path / "big.txt"
+    big_file.write_text("".join(f"line {n} é\n" for n in range(300_000)))
+
+    lines = read_lines(str(big_file))
+    first_lines = list(itertools.islice(lines, 3))
+    del lines
+
+    assert first_lines == ["line 0 é", "line 1 é", "line 2 é"]
+    assert sum(1 for _ in read_byte_lines(str(big_file))) == 300_000
+
+
+def test_lines_can_be_read_in_fixed_size_batches():
+    batches = list(read_line_batches("./src/examples/three_lines_with_a_blank.txt", 2))
+
+    assert batches == [[b"line one", b""], [b"line three"]]
+
+
+def test_the_registry_finds_the_parts_from_the_file_names():
+    registry = DayRegistry()
+
+    assert "day06" in registry.days
+    assert [s.part for s in registry.solvers_for("day01")] == ["one", "two"]
+    assert registry.solvers_for("day05") == [
+        Solver(
+            day="day05",
+            part="one",
+            module="day05.part_one_and_two",
+            function="solve_part_one",
+        ),
+        Solver(
+            day="day05",
+            part="two",
+            module="day05.part_one_and_two",
+            function="solve_part_two",
+        ),
+    ]
+
+
+def test_solvers_find_their_files_under_the_registrys_source_dir(tmp_path):
+    (tmp_path / "day01").mkdir()
+    (tmp_path / "day01" / "part_one.py").write_text("")
+
+    [solver] = DayRegistry(str(tmp_path)).solvers
+
+    assert solver.source_path == tmp_path / "day01" / "part_one.py"
+    assert solver.input_path == tmp_path / "day01" / "input.txt"
+
+
+def test_listing_the_days_does_not_import_them():
+    script = (
+        "import sys; from common import DayRegistry; DayRegistry().solvers; "
+        "print(any(m.startswith('day') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env={**os.environ, "PYTHONPATH": "./src"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+def test_the_import_time_of_a_day_is_recorded_when_it_is_loaded():
+    [solver] = [s for s in DayRegistry().solvers_for("day09") if s.part == "one"]
+    sys.modules.pop("day09.part_one_and_two", None)
+
+    solver.load()
+
+    assert import_times_by_day()["day09"] > 0
+
+
+def test_lines_can_be_summed_over_in_parallel_chunks(tmp_path):
+    numbers = tmp_path / "numbers.txt"
+    numbers.write_text("\n".join(str(n) for n in range(1, 1001)) + "\n")
+
+    assert sum_over_lines(str(numbers), int, workers=2, chunk_size=64) == 500500
+    assert sum_over_lines(str(numbers), int, workers=1) == 500500
+
+
+def test_parsed_lines_are_summed_with_parsing_as_its_own_phase(tmp_path):
+    numbers = tmp_path / "numbers.txt"
+    numbers.write_text("\n".join(f"{n} {n}" for n in range(1, 1001)) + "\n")
+
+    with recording_phases() as phases_ns:
+        total = sum_over_parsed_lines(str(numbers), str.split, len, workers=1)
+
+    assert total == 2000
+    assert phases_ns["parse"] > 0
+    assert sum_over_parsed_lines(str(numbers), str.split, len, chunk_size=64) == 2000
+
+
+def test_phases_recorded_with_workers_asked_for_are_not_lost(tmp_path):
+    numbers = tmp_path / "numbers.txt"
+    numbers.write_text("\n".join(f"{n} {n}" for n in range(1, 1001)) + "\n")
+
+    with recording_phases() as phases_ns:
+        total = sum_over_parsed_lines(
+            str(numbers), str.split, len, workers=2, chunk_size=64
+        )
+
+    assert total == 2000
+    assert phases_ns["read"] > 0
+    assert phases_ns["parse"] > 0
+
+
+def test_chunks_always_hold_whole_lines(tmp_path):
+    words = tmp_path / "words.txt"
+    words.write_text("alpha\nbeta\ngamma\ndelta")
+
+    chunks = map_reduce_chunks(str(words), bytes, list, workers=2, chunk_size=3)
+
+    assert chunks == [b"alpha\n", b"beta\n", b"gamma\n", b"delta"]
+
+
+def test_phases_are_not_recorded_unless_asked_for():
+    lines = ["a", "b"]
+
+    assert timed_iterable("read", lines) is lines
+    assert phase("parse") is phase("solve")
+
+
+def test_nested_phases_only_count_against_the_innermost_one():
+    @timed_phase("parse")
+    def parse(raw_lines):
+        return [line.upper() for line in raw_lines]
+
+    with recording_phases() as phases_ns:
+        with phase("solve"):
+            parsed = parse(timed_iterable("read", ["a", "b"]))
+
+    assert parsed == ["A", "B"]
+    assert set(phases_ns) == {"solve", "parse", "read"}
+    assert all(taken > 0 for taken in phases_ns.values())
+
+
+def test_reading_lines_is_recorded_as_a_phase():
+    with recording_phases() as phases_ns:
+        list(read_lines("./src/examples/two_lines.txt"))
+
+    assert phases_ns["read"] > 0
+
+
+def test_an_interval_set_coalesces_overlapping_and_touching_ranges():
+    interval_set = IntervalSet(
+        [
+            IntRange(start=10, stop=15),
+            IntRange(start=0, stop=5),
+            IntRange(start=5, stop=7),
+            IntRange(start=12, stop=20),
+            IntRange(start=30, stop=30),
+        ]
+    )
+
+    assert list(interval_set.ranges()) == [
+        IntRange(start=0, stop=7),
+        IntRange(start=10, stop=20),
+    ]
+    assert len(interval_set) == 17
+
+
+def test_interval_set_membership():
+    interval_set = IntervalSet([IntRange(start=0, stop=5), IntRange(start=10, stop=15)])
+
+    assert 0 in interval_set
+    assert 4 in interval_set
+    assert 5 not in interval_set
+    assert 12 in interval_set
+    assert 15 not in interval_set
+    assert -1 not in interval_set
+
+
+def test_interval_set_algebra():
+    a = IntervalSet([IntRange(start=0, stop=10), IntRange(start=20, stop=30)])
+    b = IntervalSet([IntRange(start=5, stop=25)])
+
+    assert set(a | b) == set(range(0, 30))
+    assert set(a & b) == set(range(5, 10)) | set(range(20, 25))
+    assert set(a - b) == set(range(0, 5)) | set(range(25, 30))
+    assert set(b - a) == set(range(10, 20))
+
+
+def test_an_int_range_is_the_single_range_case_of_an_interval_set():
+    int_range = IntRange(start=3, stop=8)
+
+    assert IntervalSet([int_range]) == int_range
+    assert (int_range | IntRange(start=8, stop=10)) == IntRange(start=3, stop=10)
+    assert (int_range & IntRange(start=5, stop=20)) == IntRange(start=5, stop=8)
+    assert list(int_range - IntRange(start=4, stop=6)) == [3, 6, 7]
+    assert 7 in int_range
+    assert 8 not in int_range
+
+
+def test_interval_set_algebra_matches_python_sets():
+    random = Random(2023)
+    for _ in range(200):
+        a, b = (
+            [
+                IntRange(start=start, stop=start + random.randint(0, 6))
+                for start in random.sample(range(40), random.randint(0, 5))
+            ]
+            for _ in range(2)
+        )
+        set_a = {n for r in a for n in r}
+        set_b = {n for r in b for n in r}
+
+        assert set(IntervalSet(a) | IntervalSet(b)) == set_a | set_b
+        assert set(IntervalSet(a) & IntervalSet(b)) == set_a & set_b
+        assert set(IntervalSet(a) - IntervalSet(b)) == set_a - set_b
+
+
+def test_a_file_is_only_worked_through_again_once_it_changes(tmp_path):
+    numbers = tmp_path / "numbers.txt"
+    numbers.write_text("1\n2\n")
+    calls = []
+
+    @cached_per_file
+    def total(path: str) -> int:
+        calls.append(path)
+        return sum(map(int, read_lines(path)))
+
+    assert total(str(numbers)) == 3
+    assert total(str(numbers)) == 3
+    assert len(calls) == 1
+
+    numbers.write_text("1\n2\n30\n")
+    assert total(str(numbers)) == 33
+    assert len(calls) == 2
+
+    clear_file_caches()
+    assert total(str(numbers)) == 33
+    assert len(calls) == 3
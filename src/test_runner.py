@@ -0,0 +1,119 @@
+import json
+
+from answer_cache import AnswerCache
+from runner import (
+    Solver,
+    discover_solvers,
+    format_json,
+    percentile,
+    select_solvers,
+    time_solver,
+    time_solvers,
+)
+
+
+def test_it_finds_both_parts_of_every_day():
+    solvers = discover_solvers()
+
+    assert (
+        Solver(
+            day="day01", part="one", module="day01.part_one", function="solve_part_one"
+        )
+        in solvers
+    )
+    assert [s.part for s in solvers if s.day == "day05"] == ["one", "two"]
+
+
+def test_solvers_come_back_in_day_then_part_order():
+    solvers = discover_solvers()
+
+    assert solvers == sorted(
+        solvers, key=lambda s: (s.day, ["one", "two"].index(s.part))
+    )
+
+
+def test_solvers_can_be_picked_by_day_number_or_name():
+    solvers = discover_solvers()
+
+    assert {s.day for s in select_solvers(solvers, ["1", "day06"])} == {
+        "day01",
+        "day06",
+    }
+    assert select_solvers(solvers, []) == solvers
+
+
+def test_the_percentile_is_always_a_measured_value():
+    assert percentile([5, 1, 3, 2, 4], 95) == 5
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    assert percentile(list(range(1, 101)), 95) == 95
+
+
+def test_a_solver_can_be_timed():
+    solver = Solver(
+        day="day06",
+        part="one",
+        module="day06.part_one_and_two",
+        function="solve_part_one",
+    )
+
+    timing = time_solver(solver, warmup=0, repeat=3)
+
+    assert timing.answer == 74698
+    assert len(timing.runs_ns) == 3
+    assert timing.min_ns <= timing.median_ns <= timing.p95_ns
+
+
+def test_timings_can_be_exported_as_json():
+    solver = Solver(
+        day="day06",
+        part="two",
+        module="day06.part_one_and_two",
+        function="solve_part_two",
+    )
+
+    [exported] = json.loads(format_json([time_solver(solver, repeat=2)]))
+
+    assert exported["day"] == "day06"
+    assert exported["answer"] == 27563421
+    assert exported["runs"] == 2
+
+
+def test_solvers_can_be_timed_in_a_process_pool_and_keep_their_order():
+    solvers = select_solvers(discover_solvers(), ["6", "9"])
+
+    timings = time_solvers(solvers, warmup=0, repeat=1, workers=2)
+
+    assert [t.solver for t in timings] == solvers
+    assert [t.answer for t in timings] == [74698, 27563421, 2043183816, 1118]
+
+
+def test_a_solver_can_be_broken_down_into_phases():
+    [solver] = [s for s in select_solvers(discover_solvers(), ["8"]) if s.part == "one"]
+
+    timing = time_solver(solver, warmup=0, repeat=1, phases=True)
+
+    assert timing.phases_ns is not None
+    assert {"read", "parse", "solve"} <= set(timing.phases_ns)
+    assert "phases_ns" in timing.as_dict()
+
+
+def test_every_timed_run_parses_afresh_even_when_the_other_part_already_has():
+    part_one, part_two = select_solvers(discover_solvers(), ["2"])
+    part_one.load()()
+
+    timing = time_solver(part_two, warmup=1, repeat=1, phases=True)
+
+    assert timing.phases_ns is not None
+    assert timing.phases_ns["parse"] > 0
+
+
+def test_timing_runs_the_real_solver_and_records_its_answer_in_the_cache(tmp_path):
+    solvers = select_solvers(discover_solvers(), ["6"])
+    cache = AnswerCache(str(tmp_path / "cache.json"))
+    for solver in solvers:
+        cache.record(solver, "stale")
+
+    timings = time_solvers(solvers, warmup=0, repeat=1, cache=cache)
+
+    assert [t.answer for t in timings] == [74698, 27563421]
+    assert [cache.get_or_solve(s) for s in solvers] == [74698, 27563421]